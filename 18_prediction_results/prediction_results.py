@@ -87,11 +87,11 @@ ax_before.bar(x_pos[before_predictions == 0], -np.ones(np.sum(before_predictions
              color='lightcoral', alpha=0.6, label='Predicted: Down', edgecolor='red')
 
 # Mark correct vs incorrect
-for i, (pred, actual, correct) in enumerate(zip(before_predictions, actual_direction, correct_before)):
-    marker = 'o' if correct else 'x'
-    color = 'green' if correct else 'red'
-    y_pos = 1 if pred == 1 else -1
-    ax_before.plot(i, y_pos, marker, color=color, markersize=8, markeredgewidth=2)
+y_before = np.where(before_predictions == 1, 1, -1)
+ax_before.plot(x_pos[correct_before], y_before[correct_before], 'o', color='green',
+               markersize=8, markeredgewidth=2)
+ax_before.plot(x_pos[~correct_before], y_before[~correct_before], 'x', color='red',
+               markersize=8, markeredgewidth=2)
 
 ax_before.axhline(y=0, color='black', linewidth=1)
 ax_before.set_xlabel('Day', fontsize=10)
@@ -115,11 +115,11 @@ ax_after.bar(x_pos[after_predictions == 0], -np.ones(np.sum(after_predictions ==
             color='lightcoral', alpha=0.6, label='Predicted: Down', edgecolor='red')
 
 # Mark correct vs incorrect
-for i, (pred, actual, correct) in enumerate(zip(after_predictions, actual_direction, correct_after)):
-    marker = 'o' if correct else 'x'
-    color = 'green' if correct else 'red'
-    y_pos = 1 if pred == 1 else -1
-    ax_after.plot(i, y_pos, marker, color=color, markersize=8, markeredgewidth=2)
+y_after = np.where(after_predictions == 1, 1, -1)
+ax_after.plot(x_pos[correct_after], y_after[correct_after], 'o', color='green',
+              markersize=8, markeredgewidth=2)
+ax_after.plot(x_pos[~correct_after], y_after[~correct_after], 'x', color='red',
+              markersize=8, markeredgewidth=2)
 
 ax_after.axhline(y=0, color='black', linewidth=1)
 ax_after.set_xlabel('Day', fontsize=10)
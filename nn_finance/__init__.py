@@ -0,0 +1,56 @@
+"""Neural Network Finance Toolkit Package"""
+from .store import create_array, open_array, read_manifest
+from .synthetic import simulate, generate_to_store, prices_from_log_returns
+from .labels import make_labels
+from .splits import walk_forward_splits, purged_kfold_splits, run_folds
+from .loader import BatchLoader
+from .asof import asof_join, align_streams
+from .backtest import run_backtest, performance_metrics
+from .streaming import StreamingBacktest
+from .montecarlo import simulate_accuracy_paths
+from .rolling import rolling_sharpe, rolling_max_drawdown
+from .mlp import train_mlp, predict_proba
+from .walkforward import walk_forward_backtest
+from .bootstrap import bootstrap_metrics
+from .portfolio import construct_weights
+from .risk import risk_report, rolling_beta, rolling_factor_exposures
+from .confusion import ConfusionAccumulator, ThresholdAccumulator, threshold_curves
+from .thresholds import optimize_threshold
+from .compare import evaluate_models, marker_collections
+from .calibration import PlattCalibrator, IsotonicCalibrator, reliability_curve
+from .serving import InferenceServer, run_server
+from .weights import save_weights, load_weights
+from .inference import FrozenMLP, freeze
+from .quantize import quantize_mlp, quantization_report
+from .pruning import prune_mlp, SparseMLP
+from .parallel_train import train_mlp_parallel
+from .hpsearch import successive_halving, hyperband
+
+__all__ = [
+    'create_array', 'open_array', 'read_manifest',
+    'simulate', 'generate_to_store', 'prices_from_log_returns',
+    'make_labels',
+    'walk_forward_splits', 'purged_kfold_splits', 'run_folds',
+    'BatchLoader',
+    'asof_join', 'align_streams',
+    'run_backtest', 'performance_metrics',
+    'StreamingBacktest',
+    'simulate_accuracy_paths',
+    'rolling_sharpe', 'rolling_max_drawdown',
+    'train_mlp', 'predict_proba',
+    'walk_forward_backtest',
+    'bootstrap_metrics',
+    'construct_weights',
+    'risk_report', 'rolling_beta', 'rolling_factor_exposures',
+    'ConfusionAccumulator', 'ThresholdAccumulator', 'threshold_curves',
+    'optimize_threshold',
+    'evaluate_models', 'marker_collections',
+    'PlattCalibrator', 'IsotonicCalibrator', 'reliability_curve',
+    'InferenceServer', 'run_server',
+    'save_weights', 'load_weights',
+    'FrozenMLP', 'freeze',
+    'quantize_mlp', 'quantization_report',
+    'prune_mlp', 'SparseMLP',
+    'train_mlp_parallel',
+    'successive_halving', 'hyperband',
+]
@@ -0,0 +1,209 @@
+"""
+Vectorized Backtest Engine
+
+Generalizes ``20_trading_backtest/trading_backtest.py`` from one asset and
+two hard-coded strategies to a ``(n_strategies, n_assets, n_days)`` signal
+tensor evaluated in one pass.
+
+Position rules:
+- ``long_only``:   long when the signal is >= threshold, flat otherwise
+                   (the chart's "NN Long-Only")
+- ``long_short``:  long when >= threshold, short otherwise
+                   (the chart's "NN Long/Short")
+- ``weights``:     signals are already portfolio weights
+
+Discrete rules split capital equally across assets. Time is always the last
+axis, and a signal at day ``t`` is applied to the return of day ``t`` (as in
+the chart); use ``lag=1`` when signals are formed at the previous close.
+
+Usage:
+    from nn_finance.backtest import run_backtest
+
+    result = run_backtest(signals, asset_returns, rule='long_short')
+    result['metrics']['sharpe']     # shape (n_strategies,)
+    result['equity']                # shape (n_strategies, n_days)
+"""
+
+import numpy as np
+
+from .costs import transaction_costs
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.02
+POSITION_RULES = ('long_only', 'long_short', 'weights')
+
+
+def positions_from_signals(signals, rule='long_short', threshold=0.5):
+    """
+    Convert signals into positions with one of ``POSITION_RULES``.
+
+    Works on any shape. NaN signals (asset not tradable) give a flat position.
+    """
+    signals = np.asarray(signals, dtype=float)
+    if rule == 'weights':
+        return np.nan_to_num(signals, nan=0.0)
+    missing = np.isnan(signals)
+    with np.errstate(invalid='ignore'):
+        long = signals >= threshold
+    if rule == 'long_only':
+        positions = long.astype(float)
+    elif rule == 'long_short':
+        positions = np.where(long, 1.0, -1.0)
+    else:
+        raise ValueError(f"Unknown rule '{rule}', expected one of {POSITION_RULES}")
+    positions[missing] = 0.0
+    return positions
+
+
+def equity_curve(returns):
+    """Growth of 1 unit of capital along the last axis."""
+    return np.cumprod(1 + returns, axis=-1)
+
+
+def sharpe_ratio(returns, rf=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """Annualized Sharpe ratio along the last axis (0 where volatility is 0)."""
+    excess = returns - rf / periods
+    std = np.std(returns, axis=-1)
+    safe_std = np.where(std > 0, std, 1.0)
+    return np.where(std > 0, np.sqrt(periods) * np.mean(excess, axis=-1) / safe_std, 0.0)
+
+
+def max_drawdown(returns):
+    """Maximum drawdown along the last axis, as a negative fraction.
+
+    The peak includes the starting capital, so a loss on the first day
+    already counts as a drawdown.
+    """
+    equity = equity_curve(returns)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=-1), 1.0)
+    return np.min(equity / peak - 1, axis=-1)
+
+
+def performance_metrics(returns, rf=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """
+    Full-period metrics for every series in ``returns``.
+
+    Parameters
+    ----------
+    returns : ndarray, shape (..., n_days)
+        Periodic simple returns
+    rf : float, optional
+        Annual risk-free rate used by the Sharpe ratio
+    periods : int, optional
+        Periods per year
+
+    Returns
+    -------
+    metrics : dict
+        'total_return', 'annual_return', 'annual_volatility', 'sharpe',
+        'max_drawdown' and 'win_rate', each of shape ``returns.shape[:-1]``
+    """
+    n = returns.shape[-1]
+    growth = np.prod(1 + returns, axis=-1)
+    return {
+        'total_return': growth - 1,
+        'annual_return': growth ** (periods / n) - 1,
+        'annual_volatility': np.std(returns, axis=-1) * np.sqrt(periods),
+        'sharpe': sharpe_ratio(returns, rf, periods),
+        'max_drawdown': max_drawdown(returns),
+        'win_rate': np.mean(returns > 0, axis=-1),
+    }
+
+
+def _as_signal_tensor(signals):
+    signals = np.asarray(signals, dtype=float)
+    while signals.ndim < 3:
+        signals = signals[np.newaxis]
+    return signals
+
+
+def strategy_positions(signals, rule='long_short', threshold=0.5, lag=0):
+    """
+    Positions of shape ``(n_strategies, n_assets, n_days)`` for a signal tensor.
+
+    Discrete rules are scaled by ``1 / n_assets`` (equal capital per asset).
+    With ``lag > 0`` the position at day ``t`` comes from the signal at ``t - lag``.
+    """
+    signals = _as_signal_tensor(signals)
+    positions = positions_from_signals(signals, rule, threshold)
+    if rule != 'weights':
+        positions /= signals.shape[1]
+    if lag:
+        positions = np.concatenate(
+            [np.zeros(positions.shape[:-1] + (lag,)), positions[..., :-lag]], axis=-1)
+    return positions
+
+
+def run_backtest(signals, returns, rule='long_short', threshold=0.5, lag=0,
+                 rf=RISK_FREE_RATE, costs=None, chunk_size=64):
+    """
+    Backtest many strategies over many assets in one vectorized pass.
+
+    Parameters
+    ----------
+    signals : ndarray, shape (n_strategies, n_assets, n_days)
+        Signals (``(n_assets, n_days)`` or ``(n_days,)`` for one strategy);
+        NaN marks an untradable asset-day
+    returns : ndarray, shape (n_assets, n_days) or (n_days,)
+        Asset simple returns; NaN is treated as 0
+    rule : str, optional
+        Position rule, one of ``POSITION_RULES``
+    threshold : float, optional
+        Signal level for going long (0.5 fits both 0/1 signals and probabilities)
+    lag : int, optional
+        Days between signal and the return it trades
+    rf : float, optional
+        Annual risk-free rate for the Sharpe ratio
+    costs : dict, optional
+        Keyword arguments for ``costs.transaction_costs`` (fees, slippage,
+        borrow); strategy returns and metrics are then net of costs
+    chunk_size : int, optional
+        Strategies processed at once (bounds the positions intermediate)
+
+    Returns
+    -------
+    result : dict
+        'strategy_returns' and 'equity' of shape (n_strategies, n_days),
+        'gross_exposure' and 'net_exposure' of shape (n_strategies, n_days),
+        and 'metrics' (dict of per-strategy arrays, see ``performance_metrics``).
+        With ``costs``: also 'gross_returns', 'costs' and 'turnover' of shape
+        (n_strategies, n_days), and 'annual_turnover' / 'annual_cost' metrics
+    """
+    signals = _as_signal_tensor(signals)
+    returns = np.nan_to_num(np.asarray(returns, dtype=float).reshape(signals.shape[1:]))
+    n_strategies, _, n_days = signals.shape
+
+    strategy_returns = np.empty((n_strategies, n_days))
+    gross = np.empty((n_strategies, n_days))
+    net = np.empty((n_strategies, n_days))
+    if costs is not None:
+        cost = np.empty((n_strategies, n_days))
+        traded = np.empty((n_strategies, n_days))
+    for s in range(0, n_strategies, chunk_size):
+        e = min(s + chunk_size, n_strategies)
+        positions = strategy_positions(signals[s:e], rule, threshold, lag)
+        np.einsum('sat,at->st', positions, returns, out=strategy_returns[s:e])
+        np.abs(positions).sum(axis=1, out=gross[s:e])
+        positions.sum(axis=1, out=net[s:e])
+        if costs is not None:
+            breakdown = transaction_costs(positions, **costs)
+            cost[s:e] = breakdown['trading'] + breakdown['borrow']
+            traded[s:e] = breakdown['turnover']
+
+    result = {
+        'gross_exposure': gross,
+        'net_exposure': net,
+    }
+    if costs is not None:
+        result['gross_returns'] = strategy_returns
+        result['costs'] = cost
+        result['turnover'] = traded
+        strategy_returns = strategy_returns - cost
+
+    result['strategy_returns'] = strategy_returns
+    result['equity'] = equity_curve(strategy_returns)
+    result['metrics'] = performance_metrics(strategy_returns, rf)
+    if costs is not None:
+        result['metrics']['annual_turnover'] = traded.mean(axis=-1) * TRADING_DAYS
+        result['metrics']['annual_cost'] = cost.mean(axis=-1) * TRADING_DAYS
+    return result
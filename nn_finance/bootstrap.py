@@ -0,0 +1,191 @@
+"""
+Bootstrap Confidence Intervals
+
+Confidence intervals for backtest metrics (Sharpe ratio, total return, max
+drawdown) via the stationary bootstrap (Politis & Romano) or the moving
+block bootstrap, which keep the serial dependence of daily returns.
+
+Resamples are index matrices of shape ``(n_boot, n_days)`` built without
+Python loops, and one index matrix is applied to all strategies at once, so
+every replicate keeps the cross-sectional correlation between strategies.
+Sharpe ratio and total return do not depend on the order of the resampled
+days, so they come from draw counts with one matrix product; only the
+drawdown gathers resampled paths.
+Replicates are processed in chunks sized to bound memory, optionally on a
+process pool with independent seed streams per chunk.
+
+Usage:
+    from nn_finance.bootstrap import bootstrap_metrics
+
+    ci = bootstrap_metrics(result['strategy_returns'], n_boot=5000, block=20)
+    ci['sharpe']['lower'], ci['sharpe']['upper']    # 95% interval per strategy
+    ci['sharpe']['prob_nonpositive']                # bootstrap p-value for Sharpe <= 0
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .backtest import RISK_FREE_RATE, TRADING_DAYS, max_drawdown, sharpe_ratio
+
+METHODS = ('stationary', 'block', 'iid')
+METRICS = ('sharpe', 'total_return', 'max_drawdown')
+
+
+def stationary_indices(n, n_boot, mean_block, rng):
+    """
+    Stationary-bootstrap index matrix.
+
+    Blocks start at uniform random positions and have geometric lengths with
+    mean ``mean_block``; indices wrap around the end of the series.
+
+    Returns
+    -------
+    indices : ndarray of int64, shape (n_boot, n)
+    """
+    new_block = rng.random((n_boot, n)) < 1.0 / mean_block
+    new_block[:, 0] = True
+    starts = rng.integers(0, n, (n_boot, n))
+    pos = np.arange(n)
+    block_start = np.maximum.accumulate(np.where(new_block, pos, 0), axis=1)
+    first = np.take_along_axis(starts, block_start, axis=1)
+    return (first + pos - block_start) % n
+
+
+def block_indices(n, n_boot, block, rng):
+    """
+    Moving-block-bootstrap index matrix (fixed-length blocks, no wrapping).
+
+    Returns
+    -------
+    indices : ndarray of int64, shape (n_boot, n)
+    """
+    block = min(block, n)
+    n_blocks = -(-n // block)
+    starts = rng.integers(0, n - block + 1, (n_boot, n_blocks))
+    indices = (starts[:, :, None] + np.arange(block)).reshape(n_boot, -1)
+    return indices[:, :n]
+
+
+def resample_indices(n, n_boot, method='stationary', block=20, rng=None):
+    """Index matrix for one of ``METHODS`` ('iid' ignores ``block``)."""
+    rng = np.random.default_rng() if rng is None else rng
+    if method == 'stationary':
+        return stationary_indices(n, n_boot, block, rng)
+    if method == 'block':
+        return block_indices(n, n_boot, block, rng)
+    if method == 'iid':
+        return rng.integers(0, n, (n_boot, n))
+    raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+
+
+_WORKER_RETURNS = {}
+
+
+def _init_worker(returns):
+    _WORKER_RETURNS['returns'] = returns
+
+
+def _bootstrap_chunk(n_boot, method, block, rf, seed_seq, returns=None):
+    returns = _WORKER_RETURNS['returns'] if returns is None else returns
+    n_days = returns.shape[-1]
+    rng = np.random.default_rng(seed_seq)
+    indices = resample_indices(n_days, n_boot, method, block, rng)
+
+    # Order-free metrics only need how often each day is drawn: one matmul
+    rows = np.repeat(np.arange(n_boot), n_days)
+    counts = np.bincount(rows * n_days + indices.ravel(),
+                         minlength=n_boot * n_days).reshape(n_boot, n_days).astype(float)
+    mean = (counts @ returns.T).T / n_days
+    mean_sq = (counts @ (returns * returns).T).T / n_days
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+    safe_std = np.where(std > 0, std, 1.0)
+    sharpe = np.where(std > 0, np.sqrt(TRADING_DAYS) * (mean - rf / TRADING_DAYS) / safe_std,
+                      0.0)
+    total_return = np.expm1((counts @ np.log1p(returns).T).T)
+
+    # Drawdown depends on the path: gather log returns in float32, in place
+    log_equity = np.log1p(returns).astype(np.float32)[:, indices]
+    np.cumsum(log_equity, axis=-1, out=log_equity)
+    peak = np.maximum.accumulate(log_equity, axis=-1)
+    np.maximum(peak, 0, out=peak)
+    np.subtract(peak, log_equity, out=peak)
+    max_drawdown = np.expm1(-peak.max(axis=-1).astype(float))
+
+    return {
+        'sharpe': sharpe,
+        'total_return': total_return,
+        'max_drawdown': max_drawdown,
+    }
+
+
+def bootstrap_metrics(returns, n_boot=2000, method='stationary', block=20, ci=0.95,
+                      rf=RISK_FREE_RATE, seed=42, max_elements=20_000_000, n_jobs=1,
+                      return_samples=False):
+    """
+    Bootstrap confidence intervals for every strategy.
+
+    Parameters
+    ----------
+    returns : ndarray, shape (n_strategies, n_days) or (n_days,)
+        Strategy returns
+    n_boot : int, optional
+        Bootstrap replicates
+    method : str, optional
+        One of ``METHODS``
+    block : int, optional
+        Mean (stationary) or fixed (block) block length in days
+    ci : float, optional
+        Two-sided confidence level
+    rf : float, optional
+        Annual risk-free rate for the Sharpe ratio
+    seed : int, optional
+        Root seed; each chunk gets an independent spawned stream
+    max_elements : int, optional
+        Upper bound on ``n_strategies * chunk * n_days`` per chunk
+    n_jobs : int, optional
+        Worker processes (1 runs in-process)
+    return_samples : bool, optional
+        Also return the raw bootstrap distributions
+
+    Returns
+    -------
+    intervals : dict
+        ``metric -> {'estimate', 'lower', 'upper', 'std', 'prob_nonpositive'}``
+        with arrays of shape (n_strategies,); plus 'samples' of shape
+        (n_strategies, n_boot) when ``return_samples`` is True
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=float))
+    n_strategies, n_days = returns.shape
+    chunk = max(1, min(n_boot, max_elements // (n_strategies * n_days)))
+    sizes = [min(chunk, n_boot - s) for s in range(0, n_boot, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(size, method, block, rf, ss) for size, ss in zip(sizes, seeds)]
+
+    if n_jobs == 1:
+        chunks = [_bootstrap_chunk(*a, returns=returns) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(returns,)) as pool:
+            chunks = list(pool.map(_bootstrap_chunk, *zip(*args)))
+
+    point = {
+        'sharpe': sharpe_ratio(returns, rf),
+        'total_return': np.prod(1 + returns, axis=-1) - 1,
+        'max_drawdown': max_drawdown(returns),
+    }
+    alpha = (1 - ci) / 2
+    intervals = {}
+    for name in METRICS:
+        samples = np.concatenate([c[name] for c in chunks], axis=1)
+        lower, upper = np.quantile(samples, [alpha, 1 - alpha], axis=1)
+        intervals[name] = {
+            'estimate': point[name],
+            'lower': lower,
+            'upper': upper,
+            'std': samples.std(axis=1),
+            'prob_nonpositive': (samples <= 0).mean(axis=1),
+        }
+        if return_samples:
+            intervals[name]['samples'] = samples
+    return intervals
@@ -0,0 +1,129 @@
+"""
+Batched Model Comparison
+
+Generalizes the before / after panels of
+``18_prediction_results/prediction_results.py`` from two predictors to many:
+``N`` models scored on the same test set from one ``(n_models, n_samples)``
+prediction matrix, without per-model or per-sample Python loops.
+
+Per model: accuracy, log-loss, Brier score, and the reliability table and
+expected calibration error of ``calibration.reliability_curve`` (one
+``np.bincount`` over all models).
+``marker_collections`` returns the correct / wrong marker coordinates for
+every model as arrays ready for one ``scatter`` call each.
+
+Predictions may be probabilities or hard 0/1 calls; NaN marks a missing
+prediction and is excluded from that model's scores.
+
+Usage:
+    from nn_finance.compare import evaluate_models, marker_collections
+
+    report = evaluate_models(checkpoint_probs, y_test, names=checkpoint_names)
+    report['log_loss'].argmin()                       # best checkpoint
+    markers = marker_collections(checkpoint_probs, y_test)
+    ax.scatter(markers[0]['x_correct'], markers[0]['y_correct'], marker='o')
+"""
+
+import numpy as np
+
+from .calibration import reliability_curve
+
+EPS = 1e-15
+
+
+def _as_matrix(predictions, y_true):
+    predictions = np.atleast_2d(np.asarray(predictions, dtype=float))
+    y_true = np.asarray(y_true, dtype=float).ravel()
+    if predictions.shape[1] != len(y_true):
+        raise ValueError("predictions must have shape (n_models, n_samples)")
+    return predictions, y_true
+
+
+def evaluate_models(predictions, y_true, threshold=0.5, n_bins=10, names=None):
+    """
+    Score every model on the same test set.
+
+    Parameters
+    ----------
+    predictions : ndarray, shape (n_models, n_samples)
+        Predicted probability of an up move (or 0/1 calls); NaN = missing
+    y_true : ndarray, shape (n_samples,)
+        Actual direction in {0, 1}
+    threshold : float, optional
+        Probability at which a prediction counts as "up" for accuracy
+    n_bins : int, optional
+        Equal-width probability bins for the reliability table
+    names : sequence of str, optional
+        Model names, carried through to the result
+
+    Returns
+    -------
+    report : dict
+        'names', 'n' (scored samples per model), 'accuracy', 'log_loss',
+        'brier', 'ece' (arrays of shape (n_models,)) and 'calibration' (dict
+        with 'bin_edges' and (n_models, n_bins) 'counts', 'mean_predicted',
+        'observed_frequency'; NaN for empty bins)
+    """
+    predictions, y_true = _as_matrix(predictions, y_true)
+    n_models = predictions.shape[0]
+    valid = ~np.isnan(predictions)
+    n = valid.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    p = np.where(valid, predictions, 0.5)
+    correct = ((p >= threshold) == (y_true > 0.5)) & valid
+    clipped = np.clip(p, EPS, 1 - EPS)
+    ll = -(y_true * np.log(clipped) + (1 - y_true) * np.log(1 - clipped))
+    calibration = reliability_curve(predictions, y_true, n_bins)
+    ece = calibration.pop('ece')
+    return {
+        'names': list(names) if names is not None else [f'model_{i}' for i in range(n_models)],
+        'n': n,
+        'accuracy': correct.sum(axis=1) / safe_n,
+        'log_loss': np.where(valid, ll, 0.0).sum(axis=1) / safe_n,
+        'brier': np.where(valid, (p - y_true) ** 2, 0.0).sum(axis=1) / safe_n,
+        'ece': ece,
+        'calibration': calibration,
+    }
+
+
+def marker_collections(predictions, y_true, threshold=0.5, x=None):
+    """
+    Correct / wrong marker coordinates for every model (chart's o / x marks).
+
+    Marker height is +1 for an "up" prediction and -1 for "down", as in the
+    prediction-results chart. Coordinates for all models come from one
+    ``np.nonzero`` over the matrix, split per model.
+
+    Parameters
+    ----------
+    predictions : ndarray, shape (n_models, n_samples)
+    y_true : ndarray, shape (n_samples,)
+    threshold : float, optional
+    x : ndarray, shape (n_samples,), optional
+        Horizontal positions (default: sample index)
+
+    Returns
+    -------
+    markers : list of dict
+        One dict per model with 'x_correct', 'y_correct', 'x_wrong' and
+        'y_wrong' arrays (missing predictions are left out)
+    """
+    predictions, y_true = _as_matrix(predictions, y_true)
+    x = np.arange(predictions.shape[1]) if x is None else np.asarray(x)
+    valid = ~np.isnan(predictions)
+    with np.errstate(invalid='ignore'):
+        up = predictions >= threshold
+    height = np.where(up, 1.0, -1.0)
+    correct = (up == (y_true > 0.5)) & valid
+    wrong = ~correct & valid
+
+    out = [{} for _ in range(predictions.shape[0])]
+    for label, mask in (('correct', correct), ('wrong', wrong)):
+        rows, cols = np.nonzero(mask)
+        splits = np.cumsum(mask.sum(axis=1))[:-1]
+        for marker, xs, ys in zip(out, np.split(x[cols], splits),
+                                  np.split(height[rows, cols], splits)):
+            marker[f'x_{label}'] = xs
+            marker[f'y_{label}'] = ys
+    return out
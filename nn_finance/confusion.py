@@ -0,0 +1,296 @@
+"""
+Confusion Matrices and Threshold Sweeps
+
+Data-driven replacement for the hard-coded counts in
+``19_confusion_matrix/confusion_matrix.py``.
+
+- ``ConfusionAccumulator`` adds streamed prediction batches into a confusion
+  matrix with one ``np.bincount`` per batch.
+- ``threshold_curves`` evaluates every distinct probability threshold at
+  once: scores are sorted a single time (O(n log n)) and cumulative sums give
+  the counts at each cut, from which precision, recall, F1, ROC and PR
+  curves follow.
+- ``ThresholdAccumulator`` keeps per-class score histograms, so the same
+  curves (on a fixed threshold grid) can be maintained over millions of
+  live predictions without storing them.
+- ``curves_from_counts`` turns per-threshold counts into those curves for
+  other counting schemes (``thresholds`` builds its sweep on it).
+
+Matrices have actual classes on rows and predicted classes on columns; for
+direction prediction class 1 is "up", so ``[[tn, fp], [fn, tp]]``.
+
+Usage:
+    from nn_finance.confusion import ConfusionAccumulator, threshold_curves
+
+    acc = ConfusionAccumulator()
+    for y_batch, p_batch in stream:
+        acc.update(y_batch, p_batch)
+    acc.metrics()['precision']
+
+    curves = threshold_curves(y_true, probabilities)
+    curves['roc_auc'], curves['f1'].max()
+"""
+
+import numpy as np
+
+
+def confusion_matrix(y_true, y_pred, n_classes=2):
+    """Confusion counts of shape (n_classes, n_classes) via one ``np.bincount``."""
+    y_true = np.asarray(y_true, dtype=np.int64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.int64).ravel()
+    counts = np.bincount(y_true * n_classes + y_pred, minlength=n_classes * n_classes)
+    return counts.reshape(n_classes, n_classes)
+
+
+def _ratio(num, den):
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den > 0)
+
+
+def binary_metrics(tp, fp, fn, tn):
+    """
+    Precision, recall, F1, specificity and accuracy from binary counts.
+
+    Works elementwise on arrays of counts (e.g. one entry per threshold);
+    undefined ratios are 0.
+    """
+    tp, fp, fn, tn = (np.asarray(c, dtype=float) for c in (tp, fp, fn, tn))
+    precision = _ratio(tp, tp + fp)
+    recall = _ratio(tp, tp + fn)
+    return {
+        'accuracy': _ratio(tp + tn, tp + fp + fn + tn),
+        'precision': precision,
+        'recall': recall,
+        'f1': _ratio(2 * precision * recall, precision + recall),
+        'specificity': _ratio(tn, tn + fp),
+    }
+
+
+class ConfusionAccumulator:
+    """
+    Incremental confusion matrix over streamed batches.
+
+    Parameters
+    ----------
+    n_classes : int, optional
+        Number of classes
+    threshold : float, optional
+        Cut applied to float predictions in the binary case (probabilities);
+        integer predictions are used as class labels
+    """
+
+    def __init__(self, n_classes=2, threshold=0.5):
+        self.n_classes = n_classes
+        self.threshold = threshold
+        self.counts = np.zeros((n_classes, n_classes), dtype=np.int64)
+
+    def update(self, y_true, y_pred):
+        """Add one batch; NaN predictions are skipped."""
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if np.issubdtype(y_pred.dtype, np.floating):
+            keep = ~np.isnan(y_pred)
+            y_true, y_pred = y_true[keep], y_pred[keep]
+            if self.n_classes == 2:
+                y_pred = y_pred >= self.threshold
+        self.counts += confusion_matrix(y_true, y_pred, self.n_classes)
+        return self
+
+    def merge(self, other):
+        """Add the counts of another accumulator (e.g. from a worker)."""
+        self.counts += other.counts
+        return self
+
+    def reset(self):
+        self.counts[:] = 0
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def metrics(self):
+        """
+        Metrics of the accumulated counts.
+
+        Returns
+        -------
+        metrics : dict
+            Binary: 'tp', 'fp', 'fn', 'tn' plus ``binary_metrics``.
+            Multi-class: 'accuracy' and per-class 'precision', 'recall', 'f1'
+        """
+        c = self.counts
+        if self.n_classes == 2:
+            (tn, fp), (fn, tp) = c
+            counts = {'tp': int(tp), 'fp': int(fp), 'fn': int(fn), 'tn': int(tn)}
+            return {**counts, **binary_metrics(tp, fp, fn, tn)}
+        diag = np.diag(c)
+        precision = _ratio(diag, c.sum(axis=0))
+        recall = _ratio(diag, c.sum(axis=1))
+        return {
+            'accuracy': float(_ratio(diag.sum(), c.sum())),
+            'precision': precision,
+            'recall': recall,
+            'f1': _ratio(2 * precision * recall, precision + recall),
+        }
+
+
+def curves_from_counts(thresholds, tp, fp, n_pos, n_neg):
+    """
+    Threshold curves from counts predicted up at each threshold.
+
+    Shared by ``threshold_curves``, ``ThresholdAccumulator`` and
+    ``thresholds.threshold_sweep``, which only differ in how they count.
+
+    Parameters
+    ----------
+    thresholds : ndarray
+        Thresholds in decreasing order
+    tp, fp : ndarray
+        Positives / negatives with a score at or above each threshold
+    n_pos, n_neg : int
+        Total positives / negatives
+
+    Returns
+    -------
+    curves : dict
+        Same keys as ``threshold_curves``
+    """
+    fn = n_pos - tp
+    tn = n_neg - fp
+    curves = {'thresholds': thresholds, 'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn}
+    curves.update(binary_metrics(tp, fp, fn, tn))
+    curves['tpr'] = curves['recall']
+    curves['fpr'] = _ratio(fp, n_neg)
+
+    # Anchor ROC at (0, 0) and PR at recall 0 before integrating
+    fpr = np.concatenate([[0.0], curves['fpr']])
+    tpr = np.concatenate([[0.0], curves['tpr']])
+    curves['roc_auc'] = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+    recall = np.concatenate([[0.0], curves['recall']])
+    curves['average_precision'] = float(np.sum(np.diff(recall) * curves['precision']))
+    return curves
+
+
+def threshold_curves(y_true, scores):
+    """
+    Confusion counts and metrics at every distinct score threshold.
+
+    Predicting "up" means ``score >= threshold``. Thresholds are the distinct
+    scores in decreasing order, so the curves run from the strictest cut to
+    predicting everything up.
+
+    Parameters
+    ----------
+    y_true : ndarray, shape (n_samples,)
+        Binary targets
+    scores : ndarray, shape (n_samples,)
+        Predicted probabilities (NaN entries are dropped)
+
+    Returns
+    -------
+    curves : dict
+        Arrays over thresholds: 'thresholds', 'tp', 'fp', 'fn', 'tn',
+        'accuracy', 'precision', 'recall', 'f1', 'specificity', 'tpr',
+        'fpr'; scalars 'roc_auc' and 'average_precision'
+    """
+    y_true = np.asarray(y_true).ravel().astype(bool)
+    scores = np.asarray(scores, dtype=float).ravel()
+    keep = ~np.isnan(scores)
+    y_true, scores = y_true[keep], scores[keep]
+    if not len(scores):
+        raise ValueError("No scored samples")
+
+    order = np.argsort(-scores, kind='stable')
+    scores, y_true = scores[order], y_true[order]
+    # Last position of each run of equal scores
+    cut = np.append(np.flatnonzero(np.diff(scores)), len(scores) - 1)
+
+    tp = np.cumsum(y_true)[cut]
+    fp = (cut + 1) - tp
+    n_pos = int(y_true.sum())
+    return curves_from_counts(scores[cut], tp, fp, n_pos, len(scores) - n_pos)
+
+
+def roc_curve(y_true, scores):
+    """ROC curve ``(fpr, tpr, thresholds)`` starting at (0, 0)."""
+    curves = threshold_curves(y_true, scores)
+    return (np.concatenate([[0.0], curves['fpr']]),
+            np.concatenate([[0.0], curves['tpr']]),
+            np.concatenate([[np.inf], curves['thresholds']]))
+
+
+def precision_recall_curve(y_true, scores):
+    """Precision-recall curve ``(precision, recall, thresholds)``."""
+    curves = threshold_curves(y_true, scores)
+    return curves['precision'], curves['recall'], curves['thresholds']
+
+
+def roc_auc(y_true, scores):
+    """Area under the ROC curve (ties count one half)."""
+    return threshold_curves(y_true, scores)['roc_auc']
+
+
+class ThresholdAccumulator:
+    """
+    Streaming threshold curves from per-class score histograms.
+
+    Scores in [0, 1] are binned into ``n_bins`` equal bins with
+    ``np.bincount``; curves are exact at the bin edges, which serve as the
+    threshold grid. Memory is O(n_bins) regardless of how many predictions
+    are streamed.
+
+    Parameters
+    ----------
+    n_bins : int, optional
+        Threshold resolution
+    """
+
+    def __init__(self, n_bins=1000):
+        self.n_bins = n_bins
+        self.edges = np.arange(n_bins + 1) / n_bins
+        self.hist = np.zeros((2, n_bins), dtype=np.int64)
+
+    def update(self, y_true, scores):
+        """Add one batch of binary targets and probabilities (NaN skipped)."""
+        y_true = np.asarray(y_true).ravel().astype(np.int64)
+        scores = np.asarray(scores, dtype=float).ravel()
+        keep = ~np.isnan(scores)
+        # Bin against the threshold grid itself: scores * n_bins can round a
+        # score sitting on an edge into the bin below
+        bins = np.searchsorted(self.edges, scores[keep], side='right') - 1
+        np.clip(bins, 0, self.n_bins - 1, out=bins)
+        self.hist += np.bincount(y_true[keep] * self.n_bins + bins,
+                                 minlength=2 * self.n_bins).reshape(2, self.n_bins)
+        return self
+
+    def merge(self, other):
+        """Add the histograms of another accumulator with the same ``n_bins``."""
+        self.hist += other.hist
+        return self
+
+    def reset(self):
+        self.hist[:] = 0
+
+    def curves(self):
+        """
+        Curves at thresholds ``k / n_bins`` for k = n_bins - 1, ..., 0.
+
+        Returns
+        -------
+        curves : dict
+            Same keys as ``threshold_curves``
+        """
+        # Reverse cumulative counts: predictions at or above each bin's lower edge
+        above = np.cumsum(self.hist[:, ::-1], axis=1)
+        thresholds = np.arange(self.n_bins - 1, -1, -1) / self.n_bins
+        n_neg, n_pos = above[:, -1]
+        return curves_from_counts(thresholds, above[1], above[0], int(n_pos), int(n_neg))
+
+    def confusion_at(self, threshold=0.5):
+        """Binary metrics at one grid threshold, like ``ConfusionAccumulator.metrics``."""
+        k = int(round(threshold * self.n_bins))
+        tp, fp = self.hist[1, k:].sum(), self.hist[0, k:].sum()
+        fn, tn = self.hist[1, :k].sum(), self.hist[0, :k].sum()
+        counts = {'tp': int(tp), 'fp': int(fp), 'fn': int(fn), 'tn': int(tn)}
+        return {**counts, **binary_metrics(tp, fp, fn, tn)}
@@ -0,0 +1,351 @@
+"""
+Successive-Halving / Hyperband Hyperparameter Search
+
+Samples MLP configurations (width, depth, learning rate, L2, batch size)
+and trains them on a process pool, spending epochs only on the promising
+ones instead of running every grid point to ``max_epochs``.
+
+- ``successive_halving`` runs asynchronous successive halving (ASHA, Li et
+  al., 2020): every configuration starts with ``min_epochs``; whenever a
+  trial is in the best ``1 / eta`` of those finished at its rung it is
+  promoted to ``eta`` times the epochs, continuing from its checkpoint.
+  Workers never wait for a rung to fill up.
+- ``hyperband`` runs several brackets that trade the number of
+  configurations against their starting budget, hedging against learning
+  rates that only pay off after many epochs.
+
+Every finished rung is appended as one JSON line to ``results_path`` and
+its weights are saved with ``weights.save_weights`` under
+``checkpoint_dir``. Trial ids hash the data fingerprint and the
+configuration, so re-running an interrupted search with the same
+arguments reads the finished rungs back instead of retraining them and
+resumes promoted trials from their checkpoints.
+
+Usage:
+    from nn_finance.hpsearch import successive_halving
+
+    result = successive_halving(X_train, y_train, X_val, y_val, n_configs=81,
+                                min_epochs=10, max_epochs=810, n_jobs=4,
+                                results_path='search/trials.jsonl',
+                                checkpoint_dir='search/checkpoints')
+    result['best']['config'], result['best']['val_loss']
+"""
+
+import hashlib
+import json
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+from .mlp import loss_and_grads, predict_proba, train_mlp
+from .walkforward import data_fingerprint
+from .weights import load_weights, save_weights
+
+DEFAULT_SPACE = {
+    'width': [2, 4, 8, 16, 32, 64],
+    'depth': [1, 2, 3],
+    'learning_rate': ('log', 0.01, 2.0),
+    'l2': ('log', 1e-5, 1e-1),
+    'batch_size': [None, 64, 256],
+}
+
+
+def sample_config(space, rng):
+    """
+    Draw one configuration from a search space.
+
+    ``space`` maps names to a list (uniform choice), ``('uniform', low, high)``
+    or ``('log', low, high)`` (log-uniform).
+    """
+    config = {}
+    for name, spec in space.items():
+        if isinstance(spec, tuple):
+            kind, low, high = spec
+            if kind == 'log':
+                config[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            elif kind == 'uniform':
+                config[name] = float(rng.uniform(low, high))
+            else:
+                raise ValueError(f"Unknown distribution {kind!r} for {name!r}")
+        else:
+            config[name] = spec[int(rng.integers(len(spec)))]
+    return config
+
+
+def config_hyperparams(config):
+    """``mlp.train_mlp`` keyword arguments for a configuration."""
+    hyperparams = dict(config)
+    if 'width' in hyperparams or 'depth' in hyperparams:
+        width = hyperparams.pop('width', 8)
+        depth = hyperparams.pop('depth', 1)
+        hyperparams['hidden_sizes'] = (width,) * depth
+    return hyperparams
+
+
+def rung_budgets(min_epochs, max_epochs, eta=3):
+    """Epochs per rung, growing by ``eta`` and ending at ``max_epochs``."""
+    n_rungs = int(math.floor(math.log(max_epochs / min_epochs) / math.log(eta) + 1e-9)) + 1
+    return [int(round(max_epochs / eta ** (n_rungs - 1 - k))) for k in range(n_rungs)]
+
+
+def load_results(path):
+    """Trial records from a results file (a truncated last line is skipped)."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Interrupted write
+                continue
+    return records
+
+
+def append_result(path, record):
+    """Append one trial record as a JSON line."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, default=list) + '\n'
+    with open(path, 'ab+') as f:
+        if f.seek(0, 2):
+            f.seek(-1, 2)
+            if f.read(1) != b'\n':
+                # Terminate a line cut off by an interrupted write
+                line = '\n' + line
+        f.write(line.encode())
+
+
+def _trial_id(data_hash, config):
+    payload = json.dumps({'data': data_hash, 'config': config}, sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _train_trial(data, config, start, epochs_done, epochs):
+    """Train ``config`` from ``start`` (params, weight file or None) up to ``epochs``."""
+    X, y, X_val, y_val = data
+    began = time.perf_counter()
+    if isinstance(start, str):
+        start = load_weights(start)
+    if start is None:
+        epochs_done = 0
+    params, losses = train_mlp(X, y, params=start, epochs=epochs - epochs_done,
+                               **config_hyperparams(config))
+    val_loss, _ = loss_and_grads(params, X_val, y_val)
+    val_accuracy = np.mean((predict_proba(params, X_val) >= 0.5) == (np.ravel(y_val) > 0.5))
+    record = {
+        'train_loss': float(losses[-1]) if losses else None,
+        'val_loss': float(val_loss),
+        'val_accuracy': float(val_accuracy),
+        'seconds': time.perf_counter() - began,
+    }
+    return params, record
+
+
+_SEARCH_DATA = {}
+
+
+def _init_search_worker(data):
+    _SEARCH_DATA['data'] = data
+
+
+def _run_trial(config, start, epochs_done, epochs):
+    return _train_trial(_SEARCH_DATA['data'], config, start, epochs_done, epochs)
+
+
+def successive_halving(X, y, X_val, y_val, space=None, n_configs=27, min_epochs=10,
+                       max_epochs=270, eta=3, n_jobs=1, results_path=None,
+                       checkpoint_dir=None, seed=0):
+    """
+    Asynchronous successive halving over sampled MLP configurations.
+
+    Parameters
+    ----------
+    X, y : ndarray
+        Training data
+    X_val, y_val : ndarray
+        Validation data; trials are ranked by validation log loss
+    space : dict, optional
+        Search space (default ``DEFAULT_SPACE``), see ``sample_config``
+    n_configs : int, optional
+        Configurations sampled into the lowest rung
+    min_epochs, max_epochs : int, optional
+        Budget of the lowest and highest rung
+    eta : int, optional
+        Promotion ratio: the best ``1 / eta`` of a rung move on with ``eta``
+        times the epochs
+    n_jobs : int, optional
+        Worker processes (1 runs in-process)
+    results_path : str or Path, optional
+        JSON-lines trial log; finished rungs found there are not retrained
+    checkpoint_dir : str or Path, optional
+        Directory for per-rung weight files (promotions continue from them)
+    seed : int, optional
+        Seed for sampling configurations
+
+    Returns
+    -------
+    result : dict
+        'best' (record with the lowest validation loss at the highest rung
+        reached), 'params' (its weights, None if they were not kept),
+        'trials' (one record per finished rung: 'trial_id', 'config',
+        'rung', 'epochs', losses, 'val_accuracy', 'seconds', 'checkpoint',
+        'cached') and 'budgets' (epochs per rung)
+    """
+    space = DEFAULT_SPACE if space is None else space
+    budgets = rung_budgets(min_epochs, max_epochs, eta)
+    data = tuple(np.asarray(a, dtype=float) for a in (X, y, X_val, y_val))
+    data_hash = data_fingerprint(*data)
+    stored = {}
+    if results_path is not None:
+        for record in load_results(results_path):
+            stored[(record['trial_id'], record['epochs'])] = record
+    checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir is not None else None
+    if checkpoint_dir is not None:
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    configs = {}
+    rung_losses = [{} for _ in budgets]
+    promoted = [set() for _ in budgets]
+    latest = {}                         # trial_id -> (epochs, params) of the last rung
+    trials = []
+    n_sampled = 0
+
+    def next_job():
+        nonlocal n_sampled
+        # Promote from the highest rung first so good trials finish early
+        for k in range(len(budgets) - 2, -1, -1):
+            ranked = sorted(rung_losses[k], key=rung_losses[k].get)
+            for trial_id in ranked[:len(ranked) // eta]:
+                if trial_id not in promoted[k]:
+                    promoted[k].add(trial_id)
+                    return trial_id, k + 1
+        while n_sampled < n_configs:
+            n_sampled += 1
+            config = sample_config(space, rng)
+            trial_id = _trial_id(data_hash, config)
+            if trial_id not in configs:
+                configs[trial_id] = config
+                return trial_id, 0
+        return None
+
+    def start_of(trial_id, rung):
+        if rung == 0:
+            return None, 0
+        epochs_done = budgets[rung - 1]
+        if checkpoint_dir is not None:
+            path = checkpoint_dir / f'{trial_id}-{epochs_done}.nnw'
+            if path.exists():
+                return str(path), epochs_done
+        if trial_id in latest and latest[trial_id][0] == epochs_done:
+            return latest[trial_id][1], epochs_done
+        # No checkpoint (e.g. resumed without checkpoint_dir): train from scratch
+        return None, 0
+
+    def finish(trial_id, rung, params, record, cached):
+        epochs = budgets[rung]
+        if not cached:
+            checkpoint = None
+            if checkpoint_dir is not None:
+                checkpoint = str(checkpoint_dir / f'{trial_id}-{epochs}.nnw')
+                save_weights(checkpoint, params,
+                             metadata={'trial_id': trial_id, 'epochs': epochs})
+            record = {'trial_id': trial_id, 'config': configs[trial_id], 'rung': rung,
+                      'epochs': epochs, **record, 'checkpoint': checkpoint}
+            if results_path is not None:
+                append_result(results_path, record)
+            latest[trial_id] = (epochs, params)
+        rung_losses[rung][trial_id] = record['val_loss']
+        trials.append({**record, 'rung': rung, 'cached': cached})
+
+    def cached_job(job):
+        trial_id, rung = job
+        record = stored.get((trial_id, budgets[rung]))
+        if record is not None:
+            finish(trial_id, rung, None, record, cached=True)
+            return True
+        return False
+
+    if n_jobs == 1:
+        job = next_job()
+        while job is not None:
+            if not cached_job(job):
+                trial_id, rung = job
+                start, epochs_done = start_of(trial_id, rung)
+                params, record = _train_trial(data, configs[trial_id], start, epochs_done,
+                                              budgets[rung])
+                finish(trial_id, rung, params, record, cached=False)
+            job = next_job()
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_search_worker,
+                                 initargs=(data,)) as pool:
+            running = {}
+            while True:
+                while len(running) < n_jobs:
+                    job = next_job()
+                    if job is None:
+                        break
+                    if cached_job(job):
+                        continue
+                    trial_id, rung = job
+                    start, epochs_done = start_of(trial_id, rung)
+                    future = pool.submit(_run_trial, configs[trial_id], start, epochs_done,
+                                         budgets[rung])
+                    running[future] = job
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial_id, rung = running.pop(future)
+                    params, record = future.result()
+                    finish(trial_id, rung, params, record, cached=False)
+
+    top = max(k for k, losses in enumerate(rung_losses) if losses)
+    best_id = min(rung_losses[top], key=rung_losses[top].get)
+    best = next(t for t in reversed(trials) if t['trial_id'] == best_id and t['rung'] == top)
+    return {'best': best, 'params': _best_params(best, latest), 'trials': trials,
+            'budgets': budgets}
+
+
+def _best_params(best, latest):
+    if best['trial_id'] in latest and latest[best['trial_id']][0] == best['epochs']:
+        return latest[best['trial_id']][1]
+    if best.get('checkpoint') and Path(best['checkpoint']).exists():
+        return load_weights(best['checkpoint'])
+    return None
+
+
+def hyperband(X, y, X_val, y_val, space=None, min_epochs=10, max_epochs=270, eta=3, n_jobs=1,
+              results_path=None, checkpoint_dir=None, seed=0):
+    """
+    Hyperband: successive halving over brackets with different starting budgets.
+
+    Bracket ``s`` (from the most to the least aggressive) samples
+    ``ceil((s_max + 1) / (s + 1) * eta ** s)`` configurations starting at
+    ``max_epochs / eta ** s`` epochs. Parameters are as in
+    ``successive_halving``; brackets share the results file and checkpoints.
+
+    Returns
+    -------
+    result : dict
+        'best' and 'params' over all brackets, and 'brackets' (the
+        ``successive_halving`` result of each bracket)
+    """
+    s_max = len(rung_budgets(min_epochs, max_epochs, eta)) - 1
+    brackets = []
+    for s in range(s_max, -1, -1):
+        n_configs = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        brackets.append(successive_halving(
+            X, y, X_val, y_val, space=space, n_configs=n_configs,
+            min_epochs=max(int(round(max_epochs / eta ** s)), 1), max_epochs=max_epochs,
+            eta=eta, n_jobs=n_jobs, results_path=results_path, checkpoint_dir=checkpoint_dir,
+            seed=seed + s))
+    # Prefer results at the full budget, then the lowest validation loss
+    winner = min(brackets, key=lambda b: (-b['best']['epochs'], b['best']['val_loss']))
+    return {'best': winner['best'], 'params': winner['params'], 'brackets': brackets}
@@ -0,0 +1,107 @@
+"""
+Frozen Inference Plans
+
+``mlp.forward`` allocates a fresh array for every matmul, bias add, clip,
+exponential and division, which dominates the cost of scoring one sample.
+``freeze`` turns trained parameters into an inference-only plan:
+
+- weights are converted once to C-contiguous ``(n_in, n_out)`` arrays of the
+  plan dtype, the layout ``X @ W`` reads row by row
+- the sigmoid is rewritten as ``0.5 + 0.5 * tanh(z / 2)`` and its scale and
+  shift are folded into the next layer's weights and bias, so a hidden layer
+  is one matmul into a preallocated buffer, an in-place bias add and an
+  in-place ``tanh``; only the output layer applies the final affine step
+- buffers are kept per batch size, so repeated calls with the same batch
+  size allocate nothing
+
+Results match ``mlp.predict_proba`` to rounding (the clip in
+``mlp.sigmoid`` is not needed since ``tanh`` saturates).
+
+Usage:
+    from nn_finance.inference import freeze
+
+    model = freeze(params)
+    p_up = model.predict_one(features)        # float
+    probs = model.predict(X_batch).copy()     # view into a reused buffer
+"""
+
+import numpy as np
+
+from .mlp import layer_sizes_of
+
+
+class FrozenMLP:
+    """
+    Inference-only MLP with reusable per-batch-size buffers.
+
+    Parameters
+    ----------
+    params : list of (W, b)
+        Trained parameters (copied, not modified)
+    dtype : str or numpy.dtype, optional
+        Compute dtype (float32 halves memory traffic)
+    max_buffers : int, optional
+        Distinct batch sizes whose buffers are kept; the oldest is dropped
+        beyond that
+    """
+
+    def __init__(self, params, dtype='float64', max_buffers=16):
+        self.dtype = np.dtype(dtype)
+        self.layer_sizes = layer_sizes_of(params)
+        self.weights, self.biases = [], []
+        for i, (W, b) in enumerate(params):
+            W = np.asarray(W, dtype=float)
+            b = np.asarray(b, dtype=float)
+            if i == 0:
+                # z / 2 from raw inputs
+                W, b = W / 2, b / 2
+            else:
+                # z / 2 from the previous layer's tanh(z / 2) = 2 * a - 1
+                W, b = W / 4, b / 2 + W.sum(axis=0) / 4
+            self.weights.append(np.ascontiguousarray(W, dtype=self.dtype))
+            self.biases.append(np.ascontiguousarray(b, dtype=self.dtype))
+        self.max_buffers = max_buffers
+        self._buffers = {}
+
+    def _buffers_for(self, n):
+        buffers = self._buffers.get(n)
+        if buffers is None:
+            if len(self._buffers) >= self.max_buffers:
+                del self._buffers[next(iter(self._buffers))]
+            buffers = [np.empty((n, W.shape[1]), dtype=self.dtype) for W in self.weights]
+            self._buffers[n] = buffers
+        return buffers
+
+    def forward(self, X):
+        """
+        Output activations of shape (n_samples, n_out).
+
+        The result is a view into a buffer reused by the next call with the
+        same batch size; copy it if it must be kept.
+        """
+        a = np.asarray(X, dtype=self.dtype)
+        if a.ndim == 1:
+            a = a[np.newaxis]
+        for W, b, out in zip(self.weights, self.biases, self._buffers_for(len(a))):
+            np.matmul(a, W, out=out)
+            out += b
+            np.tanh(out, out=out)
+            a = out
+        # Output sigmoid: 0.5 + 0.5 * tanh(z / 2)
+        a *= 0.5
+        a += 0.5
+        return a
+
+    def predict(self, X):
+        """Output probabilities; 1-D for a single output unit (buffer view)."""
+        out = self.forward(X)
+        return out[:, 0] if out.shape[1] == 1 else out
+
+    def predict_one(self, x):
+        """Probability for one feature vector, as a float (single output unit)."""
+        return float(self.forward(x)[0, 0])
+
+
+def freeze(params, dtype='float64', max_buffers=16):
+    """Build a ``FrozenMLP`` inference plan from trained parameters."""
+    return FrozenMLP(params, dtype, max_buffers)
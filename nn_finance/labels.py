@@ -0,0 +1,200 @@
+"""
+Multi-Horizon Labels
+
+Builds every training target for a price panel in one pass:
+
+- forward returns for several horizons
+- up/down direction labels with an optional dead band (moves under
+  ``deadband_bps`` are masked out rather than labelled)
+- triple-barrier labels (profit-take / stop-loss / time limit)
+
+All horizons are differences of a single log-price array (the cumulative sum
+of log returns), so no horizon is re-derived from scratch. Time is the last
+axis; any leading axes (paths, assets) are carried through. Positions whose
+horizon runs past the end of the data are marked invalid.
+
+Usage:
+    from nn_finance.labels import make_labels
+
+    labels = make_labels(prices, horizons=(1, 5, 20), deadband_bps=10)
+    y_next_day = labels['direction'][0]   # int8, 1 = up, 0 = down
+    usable = labels['valid'][0]           # bool mask
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def log_prices(prices=None, log_returns=None):
+    """
+    Log-price array from either prices or log returns (time on the last axis).
+
+    When built from log returns the series starts at 0 before the first
+    return, so it has one more step than ``log_returns``.
+    """
+    if (prices is None) == (log_returns is None):
+        raise ValueError("Pass exactly one of prices or log_returns")
+    if prices is not None:
+        return np.log(np.asarray(prices, dtype=float))
+    log_returns = np.asarray(log_returns, dtype=float)
+    logp = np.zeros(log_returns.shape[:-1] + (log_returns.shape[-1] + 1,))
+    np.cumsum(log_returns, axis=-1, out=logp[..., 1:])
+    return logp
+
+
+def forward_returns(logp, horizons=(1, 5, 20), log=False):
+    """
+    Forward returns for every horizon.
+
+    Parameters
+    ----------
+    logp : ndarray, shape (..., n_steps)
+        Log prices (see ``log_prices``)
+    horizons : sequence of int
+        Look-ahead in steps
+    log : bool, optional
+        Return log returns instead of simple returns
+
+    Returns
+    -------
+    returns : ndarray of float32, shape (n_horizons, ..., n_steps)
+        NaN where ``t + h`` is past the end of the data
+    """
+    n_steps = logp.shape[-1]
+    out = np.full((len(horizons),) + logp.shape, np.nan, dtype=np.float32)
+    for k, h in enumerate(horizons):
+        if h < n_steps:
+            out[k, ..., :n_steps - h] = logp[..., h:] - logp[..., :-h]
+    if not log:
+        np.expm1(out, out=out)
+    return out
+
+
+def direction_labels(fwd_returns, deadband_bps=0.0):
+    """
+    Up/down labels with a dead band.
+
+    Parameters
+    ----------
+    fwd_returns : ndarray
+        Forward returns (any shape), NaN where unavailable
+    deadband_bps : float, optional
+        Moves smaller than this (in basis points) are masked out
+
+    Returns
+    -------
+    labels : ndarray of int8
+        1 if the forward return is positive, else 0
+    valid : ndarray of bool
+        False where the return is unavailable or inside the dead band
+    """
+    labels = (fwd_returns > 0).astype(np.int8)
+    with np.errstate(invalid='ignore'):
+        valid = np.abs(fwd_returns) >= deadband_bps / 1e4
+    return labels, valid
+
+
+def triple_barrier_labels(logp, horizon, upper=0.02, lower=None, volatility=None,
+                          chunk_steps=4096):
+    """
+    Triple-barrier labels.
+
+    For each start ``t`` the log-price path over the next ``horizon`` steps is
+    checked against a profit-take barrier ``+upper`` and a stop-loss barrier
+    ``-lower``. The label is +1 if the upper barrier is touched first, -1 if
+    the lower one is, and 0 if neither is touched before the time limit.
+
+    Parameters
+    ----------
+    logp : ndarray, shape (..., n_steps)
+        Log prices
+    horizon : int
+        Time limit (vertical barrier) in steps
+    upper : float, optional
+        Profit-take barrier in log-return units (default 2%)
+    lower : float, optional
+        Stop-loss barrier (default: same as ``upper``)
+    volatility : ndarray, optional
+        Per-step volatility, same shape as ``logp``; barriers are then
+        ``upper * volatility[t]`` and ``lower * volatility[t]``
+    chunk_steps : int, optional
+        Start times processed at once (bounds the ``(chunk, horizon)`` window)
+
+    Returns
+    -------
+    labels : ndarray of int8, shape (..., n_steps)
+    touch_step : ndarray of int16, shape (..., n_steps)
+        Steps until the first barrier touch (``horizon`` if none)
+    valid : ndarray of bool, shape (..., n_steps)
+        False for the last ``horizon`` steps, where the window is incomplete
+    """
+    lower = upper if lower is None else lower
+    n_steps = logp.shape[-1]
+    labels = np.zeros(logp.shape, dtype=np.int8)
+    touch_step = np.full(logp.shape, horizon, dtype=np.int16)
+    valid = np.zeros(logp.shape, dtype=bool)
+    n_starts = n_steps - horizon
+    if n_starts <= 0:
+        return labels, touch_step, valid
+    valid[..., :n_starts] = True
+
+    windows = sliding_window_view(logp, horizon + 1, axis=-1)
+    for s in range(0, n_starts, chunk_steps):
+        e = min(s + chunk_steps, n_starts)
+        path = windows[..., s:e, 1:] - logp[..., s:e, None]
+        up_level = upper if volatility is None else upper * volatility[..., s:e, None]
+        down_level = lower if volatility is None else lower * volatility[..., s:e, None]
+
+        hit_up = path >= up_level
+        hit_down = path <= -down_level
+        first_up = np.where(hit_up.any(axis=-1), hit_up.argmax(axis=-1), horizon)
+        first_down = np.where(hit_down.any(axis=-1), hit_down.argmax(axis=-1), horizon)
+
+        first = np.minimum(first_up, first_down)
+        labels[..., s:e] = np.sign(first_down - first_up)
+        touch_step[..., s:e] = np.where(first < horizon, first + 1, horizon)
+    return labels, touch_step, valid
+
+
+def make_labels(prices=None, log_returns=None, horizons=(1, 5, 20), deadband_bps=0.0,
+                barrier_horizon=None, barrier=0.02, volatility=None):
+    """
+    Compute every label set in one pass.
+
+    Parameters
+    ----------
+    prices, log_returns : ndarray, shape (..., n_steps)
+        Exactly one must be given
+    horizons : sequence of int, optional
+        Direction / forward-return horizons (default next 1, 5 and 20 days)
+    deadband_bps : float, optional
+        Dead band for direction labels, in basis points
+    barrier_horizon : int, optional
+        Time limit for triple-barrier labels (skipped if None)
+    barrier : float, optional
+        Symmetric barrier width, in log-return units or volatility multiples
+    volatility : ndarray, optional
+        Per-step volatility for volatility-scaled barriers
+
+    Returns
+    -------
+    labels : dict
+        'horizons', 'forward_returns' (float32), 'direction' (int8) and
+        'valid' (bool), each stacked as ``(n_horizons, ..., n_steps)``; plus
+        'triple_barrier', 'touch_step' and 'barrier_valid' when requested
+    """
+    logp = log_prices(prices, log_returns)
+    fwd = forward_returns(logp, horizons)
+    direction, valid = direction_labels(fwd, deadband_bps)
+
+    result = {
+        'horizons': np.asarray(horizons),
+        'forward_returns': fwd,
+        'direction': direction,
+        'valid': valid,
+    }
+    if barrier_horizon is not None:
+        tb, touch, tb_valid = triple_barrier_labels(logp, barrier_horizon, barrier,
+                                                    volatility=volatility)
+        result.update(triple_barrier=tb, touch_step=touch, barrier_valid=tb_valid)
+    return result
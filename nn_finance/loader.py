@@ -0,0 +1,189 @@
+"""
+Prefetching Mini-Batch Loader
+
+Streams mini-batches from (memory-mapped) feature arrays for out-of-core
+training. A background thread reads ahead while the training step runs, so
+the loop waits on compute rather than disk.
+
+Shuffling never permutes the file. The rows are split into contiguous
+blocks; each epoch visits the blocks in a random order and shuffles rows
+within each block after one sequential block read. Batches are assembled in
+a small ring of preallocated buffers that are reused for the whole run.
+
+Usage:
+    from nn_finance.loader import BatchLoader
+
+    loader = BatchLoader.from_store('data/features', 'X', 'y', batch_size=512)
+    for epoch in range(10):
+        for X_batch, y_batch in loader:
+            params = train_step(params, X_batch, y_batch)
+
+Batches are views into the reusable buffers and are only valid until the
+next batch is requested; copy them if they must outlive the step.
+"""
+
+import queue
+import threading
+
+import numpy as np
+
+from .store import open_array
+
+_POLL_SECONDS = 0.1
+
+
+class BatchLoader:
+    """
+    Iterate over ``(X_batch, y_batch)`` mini-batches with background prefetching.
+
+    Parameters
+    ----------
+    X : array_like, shape (n_samples, ...)
+        Features; numpy arrays and memmaps are read lazily
+    y : array_like, shape (n_samples, ...), optional
+        Targets (batches are ``(X_batch, None)`` if omitted)
+    batch_size : int, optional
+        Rows per batch
+    shuffle : bool, optional
+        Shuffle block order and rows within blocks each epoch
+    block_size : int, optional
+        Rows per contiguous read when shuffling
+    seed : int, optional
+        Base seed; epoch ``e`` uses the stream ``(seed, e)``
+    prefetch : int, optional
+        Batches prepared ahead of the consumer
+    drop_last : bool, optional
+        Skip the final incomplete batch
+    """
+
+    def __init__(self, X, y=None, batch_size=256, shuffle=True, block_size=8192, seed=42,
+                 prefetch=2, drop_last=False):
+        if y is not None and len(y) != len(X):
+            raise ValueError("X and y must have the same number of rows")
+        self.X = X
+        self.y = y
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.block_size = max(block_size, 1)
+        self.seed = seed
+        self.prefetch = max(prefetch, 1)
+        self.drop_last = drop_last
+        self.epoch = 0
+
+        n_buffers = self.prefetch + 2
+        self._x_buffers = [np.empty((batch_size,) + X.shape[1:], dtype=X.dtype)
+                           for _ in range(n_buffers)]
+        self._y_buffers = ([np.empty((batch_size,) + y.shape[1:], dtype=y.dtype)
+                            for _ in range(n_buffers)] if y is not None else None)
+        # Staging area for one block: rows are shuffled out of RAM, not the map
+        block_rows = min(self.block_size, len(X)) if shuffle else 0
+        self._x_block = np.empty((block_rows,) + X.shape[1:], dtype=X.dtype)
+        self._y_block = (np.empty((block_rows,) + y.shape[1:], dtype=y.dtype)
+                         if y is not None else None)
+
+    @classmethod
+    def from_store(cls, store_dir, x_name, y_name=None, **kwargs):
+        """Build a loader over arrays of a memory-mapped store."""
+        X = open_array(store_dir, x_name)
+        y = open_array(store_dir, y_name) if y_name is not None else None
+        return cls(X, y, **kwargs)
+
+    def __len__(self):
+        n = len(self.X)
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+
+    def set_epoch(self, epoch):
+        """Set the epoch used for the next iteration's shuffle."""
+        self.epoch = epoch
+
+    def _segments(self, rng):
+        """Yield ``(start, stop, local_order)`` reads covering the dataset once."""
+        n = len(self.X)
+        n_blocks = -(-n // self.block_size)
+        blocks = rng.permutation(n_blocks) if self.shuffle else range(n_blocks)
+        for block in blocks:
+            start = int(block) * self.block_size
+            stop = min(start + self.block_size, n)
+            yield start, stop, rng.permutation(stop - start) if self.shuffle else None
+
+    def _produce(self, free, ready, stop_event, epoch):
+        try:
+            rng = np.random.default_rng([self.seed, epoch])
+            slot, filled = None, 0
+            for start, stop, order in self._segments(rng):
+                if order is not None:
+                    # One sequential read of the block into the staging buffer
+                    x_block = self._x_block[:stop - start]
+                    np.copyto(x_block, self.X[start:stop])
+                    if self.y is not None:
+                        y_block = self._y_block[:stop - start]
+                        np.copyto(y_block, self.y[start:stop])
+                i = 0
+                while i < stop - start:
+                    if slot is None:
+                        slot = self._get(free, stop_event)
+                        if slot is None:
+                            return
+                    take = min(self.batch_size - filled, stop - start - i)
+                    dest = slice(filled, filled + take)
+                    if order is None:
+                        src = slice(start + i, start + i + take)
+                        self._x_buffers[slot][dest] = self.X[src]
+                        if self.y is not None:
+                            self._y_buffers[slot][dest] = self.y[src]
+                    else:
+                        rows = order[i:i + take]
+                        np.take(x_block, rows, axis=0, out=self._x_buffers[slot][dest])
+                        if self.y is not None:
+                            np.take(y_block, rows, axis=0, out=self._y_buffers[slot][dest])
+                    filled += take
+                    i += take
+                    if filled == self.batch_size:
+                        ready.put((slot, filled))
+                        slot, filled = None, 0
+            if slot is not None and filled and not self.drop_last:
+                ready.put((slot, filled))
+            ready.put(None)
+        except Exception as exc:
+            ready.put(exc)
+
+    @staticmethod
+    def _get(free, stop_event):
+        while not stop_event.is_set():
+            try:
+                return free.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return None
+
+    def __iter__(self):
+        free = queue.Queue()
+        for slot in range(len(self._x_buffers)):
+            free.put(slot)
+        ready = queue.Queue()
+        stop_event = threading.Event()
+        worker = threading.Thread(target=self._produce,
+                                  args=(free, ready, stop_event, self.epoch), daemon=True)
+        worker.start()
+
+        previous = None
+        try:
+            while True:
+                # The consumer is done with the previous batch once it asks for the next
+                if previous is not None:
+                    free.put(previous)
+                    previous = None
+                item = ready.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                slot, n = item
+                previous = slot
+                x_batch = self._x_buffers[slot][:n]
+                y_batch = self._y_buffers[slot][:n] if self.y is not None else None
+                yield x_batch, y_batch
+            self.epoch += 1
+        finally:
+            stop_event.set()
+            worker.join()
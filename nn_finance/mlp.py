@@ -0,0 +1,192 @@
+"""
+NumPy MLP
+
+The notebook's network as reusable functions: ``X @ W + b`` layers with
+sigmoid hidden activations, trained by gradient descent. For direction
+prediction the output layer is a sigmoid giving the probability of a price
+increase, trained with binary cross-entropy.
+
+Parameters are a list of ``(W, b)`` pairs, one per layer, with ``W`` of
+shape ``(n_in, n_out)`` and ``b`` of shape ``(n_out,)``.
+
+Usage:
+    from nn_finance.mlp import train_mlp, predict_proba
+
+    params, losses = train_mlp(X_train, y_train, hidden_sizes=(8,), epochs=500)
+    p_up = predict_proba(params, X_test)
+"""
+
+import numpy as np
+
+
+def sigmoid(z):
+    """Sigmoid activation (clipped like the notebook to avoid overflow)."""
+    return 1 / (1 + np.exp(-np.clip(z, -500, 500)))
+
+
+def init_params(layer_sizes, seed=42):
+    """
+    Random initial parameters.
+
+    Parameters
+    ----------
+    layer_sizes : sequence of int
+        Units per layer including input and output, e.g. ``(10, 8, 1)``
+    seed : int, optional
+        Random seed
+
+    Returns
+    -------
+    params : list of (W, b)
+    """
+    rng = np.random.default_rng(seed)
+    return [(rng.standard_normal((n_in, n_out)) * np.sqrt(1.0 / n_in), np.zeros(n_out))
+            for n_in, n_out in zip(layer_sizes[:-1], layer_sizes[1:])]
+
+
+def layer_sizes_of(params):
+    """Layer sizes ``(n_in, n_hidden..., n_out)`` of a parameter list."""
+    return (params[0][0].shape[0],) + tuple(W.shape[1] for W, _ in params)
+
+
+def forward(params, X):
+    """
+    Forward propagation.
+
+    Returns
+    -------
+    activations : list of ndarray
+        Input followed by every layer's output; the last entry holds the
+        output probabilities, shape (n_samples, n_out)
+    """
+    activations = [np.asarray(X, dtype=float)]
+    for W, b in params:
+        activations.append(sigmoid(activations[-1] @ W + b))
+    return activations
+
+
+def predict_proba(params, X):
+    """Output probabilities; 1-D for a single output unit."""
+    out = forward(params, X)[-1]
+    return out[:, 0] if out.shape[1] == 1 else out
+
+
+def loss_and_grads(params, X, y, l2=0.0):
+    """
+    Binary cross-entropy loss and its gradients (backpropagation).
+
+    Parameters
+    ----------
+    params : list of (W, b)
+    X : ndarray, shape (n_samples, n_features)
+    y : ndarray, shape (n_samples,) or (n_samples, n_out)
+        Targets in {0, 1}
+    l2 : float, optional
+        L2 penalty on weights
+
+    Returns
+    -------
+    loss : float
+    grads : list of (dW, db)
+    """
+    activations = forward(params, X)
+    out = activations[-1]
+    y = np.asarray(y, dtype=float).reshape(out.shape)
+    m = X.shape[0]
+
+    eps = 1e-12
+    loss = -np.mean(y * np.log(out + eps) + (1 - y) * np.log(1 - out + eps)) * out.shape[1]
+    if l2:
+        loss += 0.5 * l2 * sum(np.sum(W * W) for W, _ in params) / m
+
+    grads = [None] * len(params)
+    delta = (out - y) / m  # sigmoid + cross-entropy
+    for i in range(len(params) - 1, -1, -1):
+        W, _ = params[i]
+        a_prev = activations[i]
+        dW = a_prev.T @ delta
+        if l2:
+            dW += l2 * W / m
+        grads[i] = (dW, delta.sum(axis=0))
+        if i:
+            delta = (delta @ W.T) * a_prev * (1 - a_prev)
+    return loss, grads
+
+
+def train_mlp(X, y, hidden_sizes=(8,), learning_rate=0.5, epochs=200, batch_size=None,
+              l2=0.0, seed=42, params=None, masks=None):
+    """
+    Train a direction classifier by (mini-batch) gradient descent.
+
+    Parameters
+    ----------
+    X : ndarray, shape (n_samples, n_features)
+    y : ndarray, shape (n_samples,)
+        Targets in {0, 1}
+    hidden_sizes : sequence of int, optional
+        Hidden layer widths (ignored when ``params`` is given)
+    learning_rate : float, optional
+    epochs : int, optional
+    batch_size : int, optional
+        Mini-batch size (default: full batch, as in the notebook)
+    l2 : float, optional
+        L2 penalty on weights
+    seed : int, optional
+        Seed for initialization and batch shuffling
+    params : list of (W, b), optional
+        Continue training from these parameters (copied, not modified)
+    masks : list of ndarray, optional
+        One 0/1 array per weight matrix; masked weights are held at zero
+        (fine-tuning after pruning)
+
+    Returns
+    -------
+    params : list of (W, b)
+    losses : list of float
+        Training loss per epoch
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if params is None:
+        params = init_params((X.shape[1],) + tuple(hidden_sizes) + (1,), seed)
+    params = [(W.copy(), b.copy()) for W, b in params]
+    if masks is not None:
+        for (W, _), mask in zip(params, masks):
+            W *= mask
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    batch_size = n if batch_size is None else batch_size
+
+    losses = []
+    for _ in range(epochs):
+        order = rng.permutation(n) if batch_size < n else None
+        epoch_loss = 0.0
+        for s in range(0, n, batch_size):
+            idx = order[s:s + batch_size] if order is not None else slice(s, s + batch_size)
+            X_batch = X[idx]
+            loss, grads = loss_and_grads(params, X_batch, y[idx], l2)
+            for (W, b), (dW, db) in zip(params, grads):
+                W -= learning_rate * dW
+                b -= learning_rate * db
+            if masks is not None:
+                for (W, _), mask in zip(params, masks):
+                    W *= mask
+            epoch_loss += loss * len(X_batch)
+        losses.append(epoch_loss / n)
+    return params, losses
+
+
+def save_params(path, params):
+    """Save parameters to an ``.npz`` file."""
+    arrays = {}
+    for i, (W, b) in enumerate(params):
+        arrays[f'W{i}'] = W
+        arrays[f'b{i}'] = b
+    np.savez(path, **arrays)
+
+
+def load_params(path):
+    """Load parameters saved by ``save_params``."""
+    with np.load(path) as data:
+        n_layers = len(data.files) // 2
+        return [(data[f'W{i}'], data[f'b{i}']) for i in range(n_layers)]
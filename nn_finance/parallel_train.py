@@ -0,0 +1,248 @@
+"""
+Data-Parallel Multi-Process Training
+
+Trains the NumPy MLP on several cores: every mini-batch is split into one
+shard per worker process, each worker computes the gradient of its shard,
+and the coordinator averages the gradients and takes the step.
+
+Everything the workers touch lives in ``multiprocessing.shared_memory``:
+the training data (copied in once), a flat parameter vector, a
+``(n_workers, n_params)`` gradient matrix and the current batch indices.
+``(W, b)`` pairs are views into the flat vectors, so parameters are never
+pickled or sent between processes; workers read the updated weights
+directly and the reduction is an in-place sum over the gradient rows.
+Two barriers per step synchronize the processes.
+
+Batches, initialization and the loss match ``mlp.train_mlp`` with the same
+seed; only floating-point summation order differs.
+
+Usage:
+    from nn_finance.parallel_train import train_mlp_parallel
+
+    params, losses = train_mlp_parallel(X, y, hidden_sizes=(64,), epochs=50,
+                                        batch_size=4096, n_workers=8)
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+import traceback
+from multiprocessing import connection, shared_memory
+
+import numpy as np
+
+from .mlp import init_params, loss_and_grads
+
+_POLL_SECONDS = 0.1
+
+
+def param_layout(layer_sizes):
+    """``(offset, shape)`` of every ``W`` and ``b`` in the flat parameter vector."""
+    layout, offset = [], 0
+    for n_in, n_out in zip(layer_sizes[:-1], layer_sizes[1:]):
+        layout.append(((offset, (n_in, n_out)), (offset + n_in * n_out, (n_out,))))
+        offset += n_in * n_out + n_out
+    return layout, offset
+
+
+def unflatten(flat, layout):
+    """``(W, b)`` views into a flat vector."""
+    return [tuple(flat[o:o + int(np.prod(shape))].reshape(shape) for o, shape in pair)
+            for pair in layout]
+
+
+def _shared_array(shape, dtype, blocks):
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    blocks.append(block)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf), (block.name, shape, dtype.str)
+
+
+def _attach(spec, blocks):
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _worker_loop(rank, n_workers, arrays, layout, barrier):
+    X, y, flat, grads, losses, batch, control = arrays
+    params = unflatten(flat, layout)
+    my_grads = unflatten(grads[rank], layout)
+    while True:
+        barrier.wait()
+        if control[0]:
+            return
+        n = int(control[1])
+        lo, hi = rank * n // n_workers, (rank + 1) * n // n_workers
+        if hi > lo:
+            idx = batch[lo:hi]
+            loss, shard_grads = loss_and_grads(params, X[idx], y[idx])
+            # Weight by shard size so the rows sum to the batch-mean gradient
+            weight = (hi - lo) / n
+            for (gW, gb), (dW, db) in zip(my_grads, shard_grads):
+                np.multiply(dW, weight, out=gW)
+                np.multiply(db, weight, out=gb)
+            losses[rank] = loss * weight
+        else:
+            grads[rank] = 0.0
+            losses[rank] = 0.0
+        barrier.wait()
+
+
+def _worker(rank, n_workers, specs, layout, barrier, errors):
+    blocks = []
+    try:
+        _worker_loop(rank, n_workers, [_attach(s, blocks) for s in specs], layout, barrier)
+    except threading.BrokenBarrierError:
+        # Another process failed and aborted the barrier
+        pass
+    except BaseException:
+        errors.put(f'worker {rank}: {traceback.format_exc()}')
+        barrier.abort()
+    finally:
+        _release(blocks)
+
+
+def _watch(workers, barrier, done):
+    """Abort the barrier if a worker exits while training (e.g. SIGKILL, OOM)."""
+    sentinels = [worker.sentinel for worker in workers]
+    while not done.is_set():
+        if connection.wait(sentinels, timeout=_POLL_SECONDS):
+            barrier.abort()
+            return
+
+
+def _failure(workers, errors):
+    try:
+        return errors.get(timeout=1)
+    except queue.Empty:
+        pass
+    for rank, worker in enumerate(workers):
+        worker.join(timeout=_POLL_SECONDS)
+        if worker.exitcode is not None:
+            return f'worker {rank}: process exited with code {worker.exitcode}'
+    return 'a worker process failed without reporting an error'
+
+
+def _release(blocks, unlink=False):
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # Arrays still referenced from an exception traceback
+            pass
+        if unlink:
+            block.unlink()
+
+
+def train_mlp_parallel(X, y, hidden_sizes=(8,), learning_rate=0.5, epochs=200,
+                       batch_size=None, l2=0.0, seed=42, params=None, n_workers=4):
+    """
+    Data-parallel version of ``mlp.train_mlp``.
+
+    Parameters
+    ----------
+    X, y, hidden_sizes, learning_rate, epochs, batch_size, l2, seed, params
+        As in ``mlp.train_mlp``
+    n_workers : int, optional
+        Worker processes; each computes the gradient of one shard per batch
+
+    Returns
+    -------
+    params : list of (W, b)
+    losses : list of float
+        Training loss per epoch
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float).reshape(len(X), -1)
+    if params is None:
+        params = init_params((X.shape[1],) + tuple(hidden_sizes) + (1,), seed)
+    layer_sizes = (params[0][0].shape[0],) + tuple(W.shape[1] for W, _ in params)
+    layout, n_params = param_layout(layer_sizes)
+    n = len(X)
+    batch_size = n if batch_size is None else batch_size
+
+    blocks, workers = [], []
+    try:
+        return _train(X, y, params, layout, n_params, learning_rate, epochs, batch_size, l2,
+                      seed, n_workers, blocks, workers)
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        _release(blocks, unlink=True)
+
+
+def _train(X, y, params, layout, n_params, learning_rate, epochs, batch_size, l2, seed,
+           n_workers, blocks, workers):
+    n = len(X)
+    shared_X, spec_X = _shared_array(X.shape, X.dtype, blocks)
+    shared_y, spec_y = _shared_array(y.shape, y.dtype, blocks)
+    flat, spec_flat = _shared_array((n_params,), 'float64', blocks)
+    grads, spec_grads = _shared_array((n_workers, n_params), 'float64', blocks)
+    losses_buf, spec_losses = _shared_array((n_workers,), 'float64', blocks)
+    batch, spec_batch = _shared_array((min(batch_size, n),), 'int64', blocks)
+    control, spec_control = _shared_array((2,), 'int64', blocks)
+    shared_X[:] = X
+    shared_y[:] = y
+    control[:] = 0
+    shared_params = unflatten(flat, layout)
+    for (W, b), (W0, b0) in zip(shared_params, params):
+        W[:] = W0
+        b[:] = b0
+
+    specs = (spec_X, spec_y, spec_flat, spec_grads, spec_losses, spec_batch, spec_control)
+    barrier = mp.Barrier(n_workers + 1)
+    errors = mp.Queue()
+    for rank in range(n_workers):
+        worker = mp.Process(target=_worker,
+                            args=(rank, n_workers, specs, layout, barrier, errors),
+                            daemon=True)
+        worker.start()
+        workers.append(worker)
+
+    # A timed-out Barrier.wait breaks the barrier for every party, so liveness
+    # is checked by a watchdog thread on the process sentinels instead
+    done = threading.Event()
+    watchdog = threading.Thread(target=_watch, args=(workers, barrier, done), daemon=True)
+    watchdog.start()
+
+    rng = np.random.default_rng(seed)
+    gradient = np.empty(n_params)
+    grad_params = unflatten(gradient, layout)
+    losses = []
+    try:
+        for _ in range(epochs):
+            order = rng.permutation(n) if batch_size < n else np.arange(n)
+            epoch_loss = 0.0
+            for s in range(0, n, batch_size):
+                idx = order[s:s + batch_size]
+                batch[:len(idx)] = idx
+                control[1] = len(idx)
+                barrier.wait()                  # workers compute shard gradients
+                barrier.wait()                  # all shards written
+                np.sum(grads, axis=0, out=gradient)
+                loss = losses_buf.sum()
+                if l2:
+                    for (W, _), (gW, _) in zip(shared_params, grad_params):
+                        gW += l2 * W / len(idx)
+                        loss += 0.5 * l2 * np.sum(W * W) / len(idx)
+                flat -= learning_rate * gradient
+                epoch_loss += loss * len(idx)
+            losses.append(epoch_loss / n)
+    except threading.BrokenBarrierError:
+        raise RuntimeError(f"Parallel training failed in {_failure(workers, errors)}") from None
+    finally:
+        done.set()
+        watchdog.join()
+        control[0] = 1
+        if not barrier.broken:
+            try:
+                barrier.wait(timeout=10)
+            except threading.BrokenBarrierError:
+                # Workers already gone; the caller joins or terminates them
+                pass
+    return [(W.copy(), b.copy()) for W, b in shared_params], losses
@@ -0,0 +1,239 @@
+"""
+Portfolio Construction
+
+Turns per-asset prediction probabilities into daily portfolio weights for a
+whole universe: top-k long/short, score-proportional weights, volatility
+targeting and gross / net exposure caps.
+
+Scores have shape ``(..., n_assets, n_days)`` (assets on the second-to-last
+axis, time on the last, optional leading strategy axes). NaN marks an asset
+that is missing on a day; it gets zero weight and is excluded from ranking
+and normalization, so the universe can change from day to day. Every step is
+vectorized across days; ranking sorts each day's cross-section once.
+
+The output feeds ``backtest.run_backtest(weights, returns, rule='weights')``.
+A score at day ``t`` is applied to the return of day ``t``, and volatility
+targeting only uses returns up to ``t - 1``.
+
+Usage:
+    from nn_finance.portfolio import construct_weights
+    from nn_finance.backtest import run_backtest
+
+    weights = construct_weights(probabilities, method='top_k', k=20,
+                                returns=asset_returns, target_vol=0.10, max_net=0.1)
+    result = run_backtest(weights, asset_returns, rule='weights')
+"""
+
+import numpy as np
+
+from .backtest import TRADING_DAYS
+from .rolling import rolling_volatility
+
+METHODS = ('top_k', 'proportional')
+
+
+def _ranks(scores, valid):
+    """Descending rank of each valid score within its day (0 = best)."""
+    filled = np.where(valid, -scores, np.inf)
+    order = np.argsort(filled, axis=-2, kind='stable')
+    ranks = np.empty(order.shape, dtype=np.int64)
+    positions = np.broadcast_to(np.arange(scores.shape[-2])[:, None], order.shape)
+    np.put_along_axis(ranks, order, positions, axis=-2)
+    return ranks
+
+
+def top_k_weights(scores, k, long_short=True):
+    """
+    Equal-weight the ``k`` highest scores (and short the ``k`` lowest).
+
+    When fewer than ``2k`` assets are valid on a long/short day, both legs
+    shrink to half the valid count so they never overlap.
+
+    Parameters
+    ----------
+    scores : ndarray, shape (..., n_assets, n_days)
+        Per-asset scores (e.g. probability of an up move); NaN = missing
+    k : int
+        Assets per leg
+    long_short : bool, optional
+        Short the bottom ``k`` as well; each leg then carries half the capital
+
+    Returns
+    -------
+    weights : ndarray, shape (..., n_assets, n_days)
+        Gross exposure 1 on days with enough valid assets, 0 otherwise
+    """
+    scores = np.asarray(scores, dtype=float)
+    valid = ~np.isnan(scores)
+    n_valid = valid.sum(axis=-2, keepdims=True)
+    ranks = _ranks(scores, valid)
+
+    k_eff = np.minimum(k, n_valid // 2 if long_short else n_valid)
+    leg = np.where(k_eff > 0, 1.0 / np.maximum(k_eff, 1), 0.0)
+    if long_short:
+        leg *= 0.5
+    weights = np.where(valid & (ranks < k_eff), leg, 0.0)
+    if long_short:
+        weights -= np.where(valid & (ranks >= n_valid - k_eff), leg, 0.0)
+    return weights
+
+
+def proportional_weights(scores, center=0.5, long_only=False, demean=False):
+    """
+    Weights proportional to each score's distance from ``center``.
+
+    Parameters
+    ----------
+    scores : ndarray, shape (..., n_assets, n_days)
+        Per-asset scores; NaN = missing
+    center : float, optional
+        Neutral score (0.5 for probabilities)
+    long_only : bool, optional
+        Drop negative weights
+    demean : bool, optional
+        Subtract the day's cross-sectional mean score instead of ``center``
+        (dollar-neutral before caps)
+
+    Returns
+    -------
+    weights : ndarray, shape (..., n_assets, n_days)
+        Gross exposure 1 on days with any non-zero weight
+    """
+    scores = np.asarray(scores, dtype=float)
+    valid = ~np.isnan(scores)
+    if demean:
+        n_valid = np.maximum(valid.sum(axis=-2, keepdims=True), 1)
+        center = np.where(valid, scores, 0.0).sum(axis=-2, keepdims=True) / n_valid
+    raw = np.where(valid, scores - center, 0.0)
+    if long_only:
+        np.maximum(raw, 0.0, out=raw)
+    gross = np.abs(raw).sum(axis=-2, keepdims=True)
+    return raw / np.where(gross > 0, gross, 1.0)
+
+
+def portfolio_returns(weights, returns):
+    """Daily portfolio returns ``sum_a w[a, t] * r[a, t]`` (NaN returns count as 0)."""
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    return np.sum(weights * returns, axis=-2)
+
+
+def volatility_target(weights, returns, target_vol=0.10, window=63, max_leverage=2.0,
+                      periods=TRADING_DAYS):
+    """
+    Scale each day's weights so trailing portfolio volatility hits ``target_vol``.
+
+    The scale at day ``t`` uses the realized volatility of the unscaled
+    portfolio over the ``window`` days ending at ``t - 1``; days without a
+    full window keep scale 1.
+
+    Parameters
+    ----------
+    weights : ndarray, shape (..., n_assets, n_days)
+    returns : ndarray, shape (n_assets, n_days)
+        Asset simple returns
+    target_vol : float, optional
+        Annualized volatility target
+    window : int, optional
+        Trailing window in days
+    max_leverage : float, optional
+        Upper bound on the scale factor
+    periods : int, optional
+        Periods per year
+
+    Returns
+    -------
+    weights : ndarray, shape (..., n_assets, n_days)
+    """
+    weights = np.asarray(weights, dtype=float)
+    n_days = weights.shape[-1]
+    scale = np.ones(weights.shape[:-2] + (n_days,))
+    if window < n_days:
+        realized = rolling_volatility(portfolio_returns(weights, returns), window, periods)
+        trailing = realized[..., window - 1:-1]
+        safe = np.where(trailing > 0, trailing, 1.0)
+        scale[..., window:] = np.where(trailing > 0,
+                                       np.minimum(target_vol / safe, max_leverage), 1.0)
+    return weights * scale[..., np.newaxis, :]
+
+
+def apply_exposure_caps(weights, max_gross=1.0, max_net=None):
+    """
+    Enforce gross and net exposure limits day by day.
+
+    A net limit shrinks only the dominant side (longs when net long, shorts
+    when net short); the gross limit then scales the whole book, which keeps
+    the net limit satisfied.
+
+    Parameters
+    ----------
+    weights : ndarray, shape (..., n_assets, n_days)
+    max_gross : float, optional
+        Maximum sum of absolute weights (None for no limit)
+    max_net : float, optional
+        Maximum absolute sum of weights (None for no limit)
+
+    Returns
+    -------
+    weights : ndarray, shape (..., n_assets, n_days)
+    """
+    weights = np.array(weights, dtype=float)
+    if max_net is not None:
+        long = np.maximum(weights, 0.0).sum(axis=-2, keepdims=True)
+        short = -np.minimum(weights, 0.0).sum(axis=-2, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            long_scale = np.where(long - short > max_net, (short + max_net) / long, 1.0)
+            short_scale = np.where(short - long > max_net, (long + max_net) / short, 1.0)
+        weights *= np.where(weights > 0, long_scale, short_scale)
+    if max_gross is not None:
+        gross = np.abs(weights).sum(axis=-2, keepdims=True)
+        weights *= np.where(gross > max_gross, max_gross / np.where(gross > 0, gross, 1.0), 1.0)
+    return weights
+
+
+def construct_weights(scores, method='top_k', k=10, long_short=True, center=0.5,
+                      demean=False, returns=None, target_vol=None, vol_window=63,
+                      max_leverage=2.0, max_gross=None, max_net=None):
+    """
+    Scores to capped portfolio weights in one call.
+
+    Parameters
+    ----------
+    scores : ndarray, shape (..., n_assets, n_days)
+        Per-asset scores; NaN = missing
+    method : str, optional
+        One of ``METHODS``
+    k, long_short
+        Passed to ``top_k_weights`` (``long_short=False`` means long-only for
+        'proportional')
+    center, demean
+        Passed to ``proportional_weights``
+    returns : ndarray, shape (n_assets, n_days), optional
+        Asset returns, required for volatility targeting
+    target_vol : float, optional
+        Annualized volatility target (no targeting if None)
+    vol_window, max_leverage
+        Passed to ``volatility_target``
+    max_gross : float, optional
+        Gross exposure cap, applied last. Defaults to 1.0 without volatility
+        targeting and to ``max_leverage`` with it, so targeting can lever up;
+        a cap below ``max_leverage`` limits how far it can
+    max_net : float, optional
+        Passed to ``apply_exposure_caps``
+
+    Returns
+    -------
+    weights : ndarray, shape (..., n_assets, n_days)
+    """
+    if method == 'top_k':
+        weights = top_k_weights(scores, k, long_short)
+    elif method == 'proportional':
+        weights = proportional_weights(scores, center, not long_short, demean)
+    else:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+    if target_vol is not None:
+        if returns is None:
+            raise ValueError("returns are required for volatility targeting")
+        weights = volatility_target(weights, returns, target_vol, vol_window, max_leverage)
+    if max_gross is None:
+        max_gross = max_leverage if target_vol is not None else 1.0
+    return apply_exposure_caps(weights, max_gross, max_net)
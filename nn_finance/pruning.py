@@ -0,0 +1,201 @@
+"""
+Magnitude Pruning and Sparse Inference
+
+Removes the near-zero weights of wide MLPs and serves what is left with
+sparse matrix products.
+
+- ``magnitude_masks`` keeps the largest ``|W|`` per layer (biases are never
+  pruned).
+- ``prune_mlp`` prunes iteratively on a cubic sparsity schedule
+  (Zhu & Gupta, 2017), fine-tuning with ``mlp.train_mlp(masks=...)`` after
+  each step so the remaining weights compensate.
+- ``SparseMLP`` stores each layer as CSR (``scipy.sparse``) when its density
+  is below ``density_threshold`` and as a dense array otherwise.
+- ``benchmark_sparsity`` times dense against CSR layers over densities and
+  batch sizes to locate the crossover for a given machine. CSR wins much
+  earlier for single-sample scoring than for large batches, where dense
+  BLAS stays competitive down to a few percent density; pick
+  ``density_threshold`` for the batch size you serve.
+
+scipy is optional: without it every layer stays dense.
+
+Usage:
+    from nn_finance.pruning import prune_mlp, SparseMLP
+
+    params, masks, history = prune_mlp(params, X_train, y_train, sparsity=0.9)
+    model = SparseMLP(params, density_threshold=0.3)
+    p_up = model.predict(X_live)
+"""
+
+import time
+
+import numpy as np
+
+from .mlp import loss_and_grads, sigmoid, train_mlp
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+
+def density(params):
+    """Share of non-zero weights per layer."""
+    return [float(np.count_nonzero(W)) / W.size for W, _ in params]
+
+
+def magnitude_masks(params, sparsity):
+    """
+    0/1 masks keeping the largest-magnitude weights of each layer.
+
+    Parameters
+    ----------
+    params : list of (W, b)
+    sparsity : float or sequence of float
+        Share of weights to remove, for all layers or per layer
+
+    Returns
+    -------
+    masks : list of ndarray
+        One float array per weight matrix, 1 = kept
+    """
+    levels = np.broadcast_to(np.asarray(sparsity, dtype=float), (len(params),))
+    masks = []
+    for (W, _), level in zip(params, levels):
+        n_prune = int(round(level * W.size))
+        mask = np.ones(W.shape)
+        if n_prune:
+            # Smallest |W| first; ties broken by position so the count is exact
+            order = np.argpartition(np.abs(W).ravel(), n_prune - 1)[:n_prune]
+            mask.ravel()[order] = 0.0
+        masks.append(mask)
+    return masks
+
+
+def prune_mlp(params, X, y, sparsity=0.9, steps=5, fine_tune_epochs=50, prune_output=False,
+              **train_kwargs):
+    """
+    Iterative magnitude pruning with fine-tuning.
+
+    Parameters
+    ----------
+    params : list of (W, b)
+        Trained parameters (not modified)
+    X, y : ndarray
+        Fine-tuning data
+    sparsity : float, optional
+        Final share of pruned weights per layer
+    steps : int, optional
+        Pruning rounds; step ``k`` targets ``sparsity * (1 - (1 - k / steps) ** 3)``
+    fine_tune_epochs : int, optional
+        ``train_mlp`` epochs after each round
+    prune_output : bool, optional
+        Also prune the (usually small) output layer
+    **train_kwargs
+        Passed to ``mlp.train_mlp`` (learning_rate, batch_size, l2, seed)
+
+    Returns
+    -------
+    params : list of (W, b)
+    masks : list of ndarray
+    history : list of dict
+        Per round: 'sparsity' target, per-layer 'density' and training 'loss'
+    """
+    params = [(W.copy(), b.copy()) for W, b in params]
+    history = []
+    for k in range(1, steps + 1):
+        level = sparsity * (1 - (1 - k / steps) ** 3)
+        levels = [level] * len(params)
+        if not prune_output:
+            levels[-1] = 0.0
+        masks = magnitude_masks(params, levels)
+        params, losses = train_mlp(X, y, params=params, masks=masks, epochs=fine_tune_epochs,
+                                   **train_kwargs)
+        history.append({'sparsity': level, 'density': density(params),
+                        'loss': losses[-1] if losses else loss_and_grads(params, X, y)[0]})
+    return params, masks, history
+
+
+class SparseMLP:
+    """
+    MLP inference with CSR layers below a density threshold.
+
+    Sparse layers store ``W.T`` as CSR, so a batch is computed as
+    ``(W.T @ X.T).T`` with the sparse matrix on the left.
+
+    Parameters
+    ----------
+    params : list of (W, b)
+    density_threshold : float, optional
+        Layers with a lower share of non-zero weights use CSR
+    """
+
+    def __init__(self, params, density_threshold=0.3):
+        self.layers = []
+        for W, b in params:
+            layer_density = np.count_nonzero(W) / W.size
+            if sparse is not None and layer_density < density_threshold:
+                self.layers.append(('csr', sparse.csr_matrix(np.asarray(W, dtype=float).T), b))
+            else:
+                self.layers.append(('dense', np.ascontiguousarray(W, dtype=float), b))
+
+    @property
+    def nbytes(self):
+        """Bytes held by weights (CSR data and indices included) and biases."""
+        total = 0
+        for kind, W, b in self.layers:
+            if kind == 'csr':
+                total += W.data.nbytes + W.indices.nbytes + W.indptr.nbytes
+            else:
+                total += W.nbytes
+            total += np.asarray(b).nbytes
+        return total
+
+    def predict(self, X):
+        """Output probabilities; 1-D for a single output unit."""
+        a = np.atleast_2d(np.asarray(X, dtype=float))
+        for kind, W, b in self.layers:
+            z = (W @ a.T).T if kind == 'csr' else a @ W
+            a = sigmoid(z + b)
+        return a[:, 0] if a.shape[1] == 1 else a
+
+
+def _seconds_per_call(fn, min_seconds):
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def benchmark_sparsity(n_in=1024, n_out=1024, densities=(0.5, 0.3, 0.2, 0.1, 0.05, 0.01),
+                       batch_sizes=(1, 64, 1024), min_seconds=0.1, seed=0):
+    """
+    Time one dense vs. CSR layer product across densities and batch sizes.
+
+    Returns
+    -------
+    results : dict
+        'rows' (list of dicts with 'density', 'batch_size', 'dense_us',
+        'sparse_us', 'speedup') and 'crossover' (batch size -> highest
+        density at which CSR was faster, None if never)
+    """
+    if sparse is None:
+        raise ImportError("benchmark_sparsity requires scipy")
+    rng = np.random.default_rng(seed)
+    rows = []
+    crossover = {n: None for n in batch_sizes}
+    for level in sorted(densities, reverse=True):
+        W = rng.standard_normal((n_in, n_out)) * (rng.random((n_in, n_out)) < level)
+        W_csr = sparse.csr_matrix(W.T)
+        for n in batch_sizes:
+            X = rng.standard_normal((n, n_in))
+            dense_s = _seconds_per_call(lambda: X @ W, min_seconds)
+            sparse_s = _seconds_per_call(lambda: (W_csr @ X.T).T, min_seconds)
+            rows.append({'density': level, 'batch_size': n, 'dense_us': dense_s * 1e6,
+                         'sparse_us': sparse_s * 1e6, 'speedup': dense_s / sparse_s})
+            if sparse_s < dense_s and crossover[n] is None:
+                crossover[n] = level
+    return {'rows': rows, 'crossover': crossover}
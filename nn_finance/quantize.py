@@ -0,0 +1,220 @@
+"""
+Int8 Post-Training Quantization
+
+Shrinks MLP weights 8x versus float64 (4x versus float32) so hundreds of
+per-ticker models fit in cache and RAM:
+
+- weights: symmetric int8 per output channel (one scale per column of ``W``)
+- activations: symmetric int8 per layer input, with the scale calibrated on
+  a sample of inputs (a high percentile of ``|a|`` to ignore outliers)
+- matmuls accumulate in int32 and are rescaled by ``s_x * s_w`` before the
+  float bias and sigmoid
+
+NumPy has no int8 GEMM kernel and integer matmul does not use BLAS. When
+``127 * 127 * n_in < 2**24`` every int32 partial sum is exactly
+representable in float32, so the int8 operands are multiplied with float32
+BLAS instead, with bit-identical accumulations. Those float32 operands are
+built once at construction; wider layers refill a preallocated float64
+scratch copy per call (exact up to ``2**53``, still BLAS). int8 stays the
+stored format and ``compute_nbytes`` reports the extra working memory.
+
+Usage:
+    from nn_finance.quantize import quantize_mlp, quantization_report
+
+    qmodel = quantize_mlp(params, X_calibration)
+    p_up = qmodel.predict(X_live)
+    quantization_report(params, qmodel, X_test, y_test)['agreement']
+"""
+
+import time
+
+import numpy as np
+
+from .inference import freeze
+from .mlp import predict_proba, sigmoid
+
+QMAX = 127
+_EXACT_FLOAT32 = 2 ** 24
+
+
+def quantize_per_channel(W):
+    """
+    Symmetric int8 quantization with one scale per output column.
+
+    Returns
+    -------
+    W_q : ndarray of int8, shape (n_in, n_out)
+    scales : ndarray of float32, shape (n_out,)
+        ``W ~= W_q * scales``
+    """
+    W = np.asarray(W, dtype=float)
+    max_abs = np.abs(W).max(axis=0)
+    scales = np.where(max_abs > 0, max_abs / QMAX, 1.0)
+    W_q = np.clip(np.rint(W / scales), -QMAX, QMAX).astype(np.int8)
+    return W_q, scales.astype(np.float32)
+
+
+def calibrate_activation_scales(params, X, percentile=99.99):
+    """
+    Per-layer input scales from a calibration sample.
+
+    Returns
+    -------
+    scales : list of float
+        ``percentile`` of ``|a|`` over the sample for each layer's input,
+        divided by 127
+    """
+    a = np.asarray(X, dtype=float)
+    scales = []
+    for W, b in params:
+        bound = np.percentile(np.abs(a), percentile)
+        scales.append(float(bound / QMAX) if bound > 0 else 1.0)
+        a = sigmoid(a @ W + b)
+    return scales
+
+
+class QuantizedMLP:
+    """
+    Int8-weight MLP with calibrated int8 activations and int32 accumulation.
+
+    Parameters
+    ----------
+    params : list of (W, b)
+        Trained float parameters
+    X_calibration : ndarray, shape (n_samples, n_features)
+        Representative inputs for the activation scales
+    percentile : float, optional
+        Percentile of ``|a|`` mapped to 127
+    """
+
+    def __init__(self, params, X_calibration, percentile=99.99):
+        self.input_scales = calibrate_activation_scales(params, X_calibration, percentile)
+        self.weights, self.weight_scales, self.biases = [], [], []
+        # Matmul operands: integer-valued float32 copies where exact, else a
+        # float64 scratch buffer refilled per call
+        self._operands, self._exact = [], []
+        for W, b in params:
+            W_q, scales = quantize_per_channel(W)
+            self.weights.append(W_q)
+            self.weight_scales.append(scales)
+            self.biases.append(np.asarray(b, dtype=np.float32))
+            exact = QMAX * QMAX * W_q.shape[0] < _EXACT_FLOAT32
+            self._exact.append(exact)
+            self._operands.append(W_q.astype(np.float32) if exact
+                                  else np.empty(W_q.shape, dtype=np.float64))
+        self._inverse_scales = [np.float32(1 / x_scale) for x_scale in self.input_scales]
+        self._rescale = [np.float32(x_scale) * w_scale
+                         for x_scale, w_scale in zip(self.input_scales, self.weight_scales)]
+
+    @property
+    def nbytes(self):
+        """Bytes held by weights, scales and biases."""
+        arrays = self.weights + self.weight_scales + self.biases
+        return sum(a.nbytes for a in arrays) + 4 * len(self.input_scales)
+
+    @property
+    def compute_nbytes(self):
+        """Bytes of the float32 / float64 matmul operands kept next to the int8 weights."""
+        return sum(a.nbytes for a in self._operands)
+
+    def _int_matmul(self, x_q, layer):
+        """int32-accumulated product of integer-valued ``x_q`` and layer ``layer``, as float32."""
+        operand = self._operands[layer]
+        if self._exact[layer]:
+            # Exact: every partial sum fits float32's 24-bit mantissa
+            return x_q @ operand
+        np.copyto(operand, self.weights[layer])
+        return (x_q.astype(np.float64) @ operand).astype(np.float32)
+
+    def predict(self, X):
+        """Output probabilities; 1-D for a single output unit."""
+        a = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        for layer, b in enumerate(self.biases):
+            # Integer-valued activations held in float32 (same values as int8)
+            x_q = a * self._inverse_scales[layer]
+            np.rint(x_q, out=x_q)
+            np.clip(x_q, -QMAX, QMAX, out=x_q)
+            z = self._int_matmul(x_q, layer)
+            z *= self._rescale[layer]
+            z += b
+            # In-place sigmoid: 0.5 + 0.5 * tanh(z / 2)
+            z *= 0.5
+            np.tanh(z, out=z)
+            z *= 0.5
+            z += 0.5
+            a = z
+        return a[:, 0] if a.shape[1] == 1 else a
+
+
+def quantize_mlp(params, X_calibration, percentile=99.99):
+    """Build a ``QuantizedMLP`` from trained parameters and calibration inputs."""
+    return QuantizedMLP(params, X_calibration, percentile)
+
+
+def quantization_report(params, qmodel, X, y=None, threshold=0.5):
+    """
+    Accuracy of the quantized model against the float model.
+
+    Returns
+    -------
+    report : dict
+        'max_abs_error' and 'mean_abs_error' of the probabilities,
+        'agreement' (share of identical up/down calls), float and quantized
+        'accuracy' when ``y`` is given, and weight memory in bytes
+        ('float64_bytes', 'float32_bytes', 'int8_bytes', 'compression',
+        and 'compute_bytes' for the matmul operands held while serving)
+    """
+    p_float = predict_proba(params, X)
+    p_quant = qmodel.predict(X)
+    error = np.abs(p_float - p_quant)
+    float64_bytes = sum(W.size * 8 + b.size * 8 for W, b in params)
+    report = {
+        'max_abs_error': float(error.max()),
+        'mean_abs_error': float(error.mean()),
+        'agreement': float(np.mean((p_float >= threshold) == (p_quant >= threshold))),
+        'float64_bytes': float64_bytes,
+        'float32_bytes': float64_bytes // 2,
+        'int8_bytes': qmodel.nbytes,
+        'compression': float64_bytes / qmodel.nbytes,
+        'compute_bytes': qmodel.compute_nbytes,
+    }
+    if y is not None:
+        y = np.asarray(y) > 0.5
+        report['float_accuracy'] = float(np.mean((p_float >= threshold) == y))
+        report['quantized_accuracy'] = float(np.mean((p_quant >= threshold) == y))
+    return report
+
+
+def _rows_per_second(fn, X, min_seconds):
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls * len(X) / elapsed
+
+
+def benchmark_quantized(params, qmodel, X, batch_sizes=(1, 64, 1024), min_seconds=0.2):
+    """
+    Throughput of float, frozen float32 and int8 inference.
+
+    Returns
+    -------
+    results : list of dict
+        One row per batch size with rows per second for 'float64'
+        (``mlp.predict_proba``), 'frozen_float32' (``inference.freeze``) and
+        'int8', and the matching microseconds per call under '<name>_us'
+    """
+    frozen = freeze(params, dtype='float32')
+    models = {'float64': lambda x: predict_proba(params, x),
+              'frozen_float32': frozen.predict, 'int8': qmodel.predict}
+    results = []
+    for n in batch_sizes:
+        batch = np.resize(np.asarray(X, dtype=float), (n, X.shape[1]))
+        row = {'batch_size': n}
+        for name, fn in models.items():
+            row[name] = _rows_per_second(fn, batch, min_seconds)
+            row[f'{name}_us'] = n / row[name] * 1e6
+        results.append(row)
+    return results
@@ -0,0 +1,215 @@
+"""
+Risk Analytics
+
+Value at Risk, Conditional VaR (expected shortfall), rolling beta and factor
+exposures for thousands of strategy return series at once (time on the last
+axis, any leading axes).
+
+VaR and CVaR are reported as positive loss fractions: a 95% VaR of 0.02
+means a daily loss of 2% or more happens on 5% of days. Historical figures
+use one ``np.partition`` per series instead of a full sort; parametric
+figures assume normal returns.
+
+Regressions solve the normal equations for all strategies together: one
+factorization of the shared factor matrix for full-sample exposures, and a
+batched ``np.linalg.solve`` over windowed ``X'X`` / ``X'y`` sums built from
+cumulative sums for rolling exposures, so no window is sliced out
+explicitly.
+
+Usage:
+    from nn_finance.risk import risk_report
+
+    report = risk_report(result['strategy_returns'], benchmark=market_returns,
+                         factors=factor_returns, level=0.99)
+    report['historical_cvar']           # shape (n_strategies,)
+    report['exposures']['betas']        # shape (n_strategies, n_factors)
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+from .rolling import check_window, pad_windowed, window_sums
+
+
+def _tail_count(n, level):
+    if not 0 < level < 1:
+        raise ValueError("level must be between 0 and 1")
+    return max(1, int(np.ceil(round(n * (1 - level), 9))))
+
+
+def historical_var(returns, level=0.95):
+    """Historical VaR along the last axis: the loss at the ``1 - level`` tail."""
+    returns = np.asarray(returns, dtype=float)
+    k = _tail_count(returns.shape[-1], level)
+    return -np.partition(returns, k - 1, axis=-1)[..., k - 1]
+
+
+def historical_cvar(returns, level=0.95):
+    """Historical CVaR along the last axis: mean loss over the worst ``1 - level`` days."""
+    returns = np.asarray(returns, dtype=float)
+    k = _tail_count(returns.shape[-1], level)
+    return -np.partition(returns, k - 1, axis=-1)[..., :k].mean(axis=-1)
+
+
+def parametric_var(returns, level=0.95):
+    """Normal (variance-covariance) VaR along the last axis."""
+    returns = np.asarray(returns, dtype=float)
+    z = NormalDist().inv_cdf(1 - level)
+    return -(returns.mean(axis=-1) + z * returns.std(axis=-1))
+
+
+def parametric_cvar(returns, level=0.95):
+    """Normal CVaR along the last axis: ``-(mu - sigma * pdf(z) / (1 - level))``."""
+    returns = np.asarray(returns, dtype=float)
+    normal = NormalDist()
+    tail = normal.pdf(normal.inv_cdf(1 - level)) / (1 - level)
+    return -(returns.mean(axis=-1) - tail * returns.std(axis=-1))
+
+
+def beta(returns, benchmark):
+    """Full-sample beta of every series to ``benchmark`` (shape (n_days,))."""
+    returns = np.asarray(returns, dtype=float)
+    benchmark = np.asarray(benchmark, dtype=float)
+    b = benchmark - benchmark.mean()
+    var = b @ b
+    if var == 0:
+        return np.zeros(returns.shape[:-1])
+    return (returns - returns.mean(axis=-1, keepdims=True)) @ b / var
+
+
+def rolling_beta(returns, benchmark, window):
+    """
+    Rolling beta to ``benchmark`` from windowed sums (O(n) per series).
+
+    Parameters
+    ----------
+    returns : ndarray, shape (..., n_days)
+    benchmark : ndarray, shape (n_days,)
+    window : int
+
+    Returns
+    -------
+    beta : ndarray, shape (..., n_days)
+        First ``window - 1`` values are NaN; 0 where the benchmark is flat
+    """
+    returns = check_window(returns, window)
+    benchmark = np.asarray(benchmark, dtype=float)
+    # Centre both series to limit cancellation in the windowed moments
+    x = benchmark - benchmark.mean()
+    y = returns - returns.mean(axis=-1, keepdims=True)
+    sx = window_sums(x, window) / window
+    sxx = window_sums(x * x, window) / window - sx * sx
+    sxy = window_sums(y * x, window) / window - window_sums(y, window) / window * sx
+    safe = np.where(sxx > 0, sxx, 1.0)
+    return pad_windowed(np.where(sxx > 0, sxy / safe, 0.0), window)
+
+
+def _design(factors, intercept):
+    factors = np.asarray(factors, dtype=float)
+    factors = factors[np.newaxis] if factors.ndim == 1 else factors
+    if intercept:
+        factors = np.concatenate([np.ones((1, factors.shape[-1])), factors])
+    return factors
+
+
+def factor_exposures(returns, factors, intercept=True):
+    """
+    Full-sample OLS exposures of every series to the factor series.
+
+    Parameters
+    ----------
+    returns : ndarray, shape (..., n_days)
+    factors : ndarray, shape (n_factors, n_days) or (n_days,)
+    intercept : bool, optional
+        Fit a daily alpha
+
+    Returns
+    -------
+    exposures : dict
+        'betas' of shape (..., n_factors), 'alpha' of shape (...) (daily, 0
+        without intercept) and 'r_squared' of shape (...)
+    """
+    returns = np.asarray(returns, dtype=float)
+    X = _design(factors, intercept)
+    # One least-squares solve with every strategy as a right-hand side
+    flat = returns.reshape(-1, returns.shape[-1])
+    coef = np.linalg.lstsq(X.T, flat.T, rcond=None)[0].T
+    resid = flat - coef @ X
+    centred = flat - flat.mean(axis=-1, keepdims=True)
+    ss_tot = np.einsum('st,st->s', centred, centred)
+    ss_res = np.einsum('st,st->s', resid, resid)
+    r_squared = np.where(ss_tot > 0, 1 - ss_res / np.where(ss_tot > 0, ss_tot, 1.0), 0.0)
+
+    lead = returns.shape[:-1]
+    return {
+        'betas': coef[:, int(intercept):].reshape(lead + (X.shape[0] - int(intercept),)),
+        'alpha': coef[:, 0].reshape(lead) if intercept else np.zeros(lead),
+        'r_squared': r_squared.reshape(lead),
+    }
+
+
+def rolling_factor_exposures(returns, factors, window, intercept=True, ridge=1e-12):
+    """
+    Rolling OLS exposures via batched normal equations.
+
+    ``X'X`` for every window comes from cumulative sums of factor outer
+    products, ``X'y`` from cumulative sums of factor-weighted returns, and
+    all windows and strategies are solved in one batched call.
+
+    Parameters
+    ----------
+    returns : ndarray, shape (..., n_days)
+    factors : ndarray, shape (n_factors, n_days) or (n_days,)
+    window : int
+    intercept : bool, optional
+    ridge : float, optional
+        Relative diagonal loading that keeps flat windows solvable
+
+    Returns
+    -------
+    exposures : dict
+        'betas' of shape (..., n_factors, n_days) and 'alpha' of shape
+        (..., n_days), NaN for the first ``window - 1`` days
+    """
+    returns = check_window(returns, window)
+    X = _design(factors, intercept)
+    k = X.shape[0]
+    xtx = window_sums(X[:, None, :] * X[None, :, :], window)        # (k, k, W)
+    xtx = np.moveaxis(xtx, -1, 0)                                     # (W, k, k)
+    scale = np.trace(xtx, axis1=-2, axis2=-1)[:, None, None] / k
+    xtx = xtx + ridge * np.where(scale > 0, scale, 1.0) * np.eye(k)
+    xty = window_sums(returns[..., None, :] * X, window)             # (..., k, W)
+    coef = np.linalg.solve(xtx, np.moveaxis(xty, -1, -2)[..., None])[..., 0]
+    coef = pad_windowed(np.moveaxis(coef, -1, -2), window)                    # (..., k, n_days)
+
+    lead = returns.shape[:-1]
+    return {
+        'betas': coef[..., int(intercept):, :],
+        'alpha': coef[..., 0, :] if intercept else np.zeros(lead + (returns.shape[-1],)),
+    }
+
+
+def risk_report(returns, level=0.95, benchmark=None, factors=None):
+    """
+    VaR / CVaR for every series plus optional beta and factor exposures.
+
+    Returns
+    -------
+    report : dict
+        'historical_var', 'historical_cvar', 'parametric_var',
+        'parametric_cvar', and 'beta' / 'exposures' when ``benchmark`` /
+        ``factors`` are given
+    """
+    returns = np.asarray(returns, dtype=float)
+    report = {
+        'historical_var': historical_var(returns, level),
+        'historical_cvar': historical_cvar(returns, level),
+        'parametric_var': parametric_var(returns, level),
+        'parametric_cvar': parametric_cvar(returns, level),
+    }
+    if benchmark is not None:
+        report['beta'] = beta(returns, benchmark)
+    if factors is not None:
+        report['exposures'] = factor_exposures(returns, factors)
+    return report
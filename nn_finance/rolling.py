@@ -0,0 +1,171 @@
+"""
+Rolling Performance Metrics
+
+Rolling-window Sharpe, Sortino, volatility, hit rate, max drawdown and Calmar
+ratio in O(n) per series, for whole strategy panels at once (time on the
+last axis, any leading axes).
+
+Means and variances use windowed differences of cumulative sums. Rolling
+max drawdown uses the van Herk / Gil-Werman block decomposition: the series
+is cut into blocks of the window length, prefix and suffix running
+max / min / drawdown are computed per block with ``ufunc.accumulate``, and
+each window combines one block suffix with the next block's prefix. This
+gives the same O(n) bound as a monotonic deque but stays vectorized across
+strategies.
+
+Output has the input's shape; the first ``window - 1`` values are NaN.
+Inputs are assumed free of NaN.
+
+``window_sums``, ``pad_windowed`` and ``check_window`` are the building
+blocks of these metrics and are public for other windowed statistics
+(``risk`` uses them for rolling beta and factor exposures).
+
+Usage:
+    from nn_finance.rolling import rolling_sharpe, rolling_max_drawdown
+
+    sharpe_63d = rolling_sharpe(strategy_returns, window=63)   # (n_strategies, n_days)
+    mdd_252d = rolling_max_drawdown(strategy_returns, window=252)
+"""
+
+import numpy as np
+
+from .backtest import RISK_FREE_RATE, TRADING_DAYS
+
+
+def pad_windowed(values, window):
+    """Left-pad windowed results with NaN back to the full series length."""
+    out = np.full(values.shape[:-1] + (values.shape[-1] + window - 1,), np.nan)
+    out[..., window - 1:] = values
+    return out
+
+
+def window_sums(x, window):
+    """Sum over every complete window along the last axis."""
+    c = np.zeros(x.shape[:-1] + (x.shape[-1] + 1,))
+    np.cumsum(x, axis=-1, out=c[..., 1:])
+    return c[..., window:] - c[..., :-window]
+
+
+def check_window(returns, window):
+    """``returns`` as a float array, after checking ``1 <= window <= n_days``."""
+    returns = np.asarray(returns, dtype=float)
+    if not 1 <= window <= returns.shape[-1]:
+        raise ValueError(f"window must be between 1 and {returns.shape[-1]}")
+    return returns
+
+
+def rolling_mean(returns, window):
+    """Rolling mean along the last axis."""
+    returns = check_window(returns, window)
+    return pad_windowed(window_sums(returns, window) / window, window)
+
+
+def _rolling_mean_std(returns, window):
+    # Centre each series first to limit cancellation in sum(x^2) - sum(x)^2
+    centre = returns.mean(axis=-1, keepdims=True)
+    x = returns - centre
+    s1 = window_sums(x, window) / window
+    s2 = window_sums(x * x, window) / window
+    std = np.sqrt(np.maximum(s2 - s1 * s1, 0.0))
+    return s1 + centre, std
+
+
+def rolling_volatility(returns, window, periods=TRADING_DAYS):
+    """Rolling annualized volatility (population standard deviation)."""
+    returns = check_window(returns, window)
+    _, std = _rolling_mean_std(returns, window)
+    return pad_windowed(std * np.sqrt(periods), window)
+
+
+def rolling_sharpe(returns, window, rf=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """Rolling annualized Sharpe ratio (same definition as ``backtest.sharpe_ratio``)."""
+    returns = check_window(returns, window)
+    mean, std = _rolling_mean_std(returns, window)
+    safe_std = np.where(std > 0, std, 1.0)
+    sharpe = np.where(std > 0, np.sqrt(periods) * (mean - rf / periods) / safe_std, 0.0)
+    return pad_windowed(sharpe, window)
+
+
+def rolling_sortino(returns, window, rf=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """Rolling annualized Sortino ratio (downside deviation below 0)."""
+    returns = check_window(returns, window)
+    mean = window_sums(returns, window) / window
+    downside = np.minimum(returns, 0.0)
+    dd = np.sqrt(window_sums(downside * downside, window) / window)
+    excess = mean - rf / periods
+    safe_dd = np.where(dd > 0, dd, 1.0)
+    # No downside: unbounded if the window beat the risk-free rate, else 0
+    sortino = np.where(dd > 0, np.sqrt(periods) * excess / safe_dd,
+                       np.where(excess > 0, np.inf, 0.0))
+    return pad_windowed(sortino, window)
+
+
+def rolling_hit_rate(returns, window):
+    """Rolling share of positive returns."""
+    returns = check_window(returns, window)
+    return pad_windowed(window_sums((returns > 0).astype(float), window) / window, window)
+
+
+def _sliding_max_drop(series, size):
+    """
+    ``max(series[i] - series[j])`` over ``i <= j`` for every window of ``size``
+    consecutive points along the last axis (van Herk / Gil-Werman blocks).
+    """
+    n = series.shape[-1]
+    n_blocks = -(-n // size)
+    pad = n_blocks * size - n
+    if pad:
+        series = np.concatenate([series, np.repeat(series[..., -1:], pad, axis=-1)], axis=-1)
+    blocks = series.reshape(series.shape[:-1] + (n_blocks, size))
+
+    # Prefix statistics: from block start up to each point
+    prefix_max = np.maximum.accumulate(blocks, axis=-1)
+    prefix_min = np.minimum.accumulate(blocks, axis=-1)
+    prefix_drop = np.maximum.accumulate(prefix_max - blocks, axis=-1)
+
+    # Suffix statistics: from each point to block end
+    rev = blocks[..., ::-1]
+    suffix_max = np.maximum.accumulate(rev, axis=-1)[..., ::-1]
+    suffix_drop = np.maximum.accumulate(rev - np.minimum.accumulate(rev, axis=-1),
+                                        axis=-1)[..., ::-1]
+
+    flat = series.shape
+    prefix_min, prefix_drop = prefix_min.reshape(flat), prefix_drop.reshape(flat)
+    suffix_max, suffix_drop = suffix_max.reshape(flat), suffix_drop.reshape(flat)
+
+    starts = np.arange(n - size + 1)
+    ends = starts + size - 1
+    combined = np.maximum(
+        np.maximum(suffix_drop[..., starts], prefix_drop[..., ends]),
+        suffix_max[..., starts] - prefix_min[..., ends])
+    return np.where(starts % size == 0, suffix_drop[..., starts], combined)
+
+
+def rolling_max_drawdown(returns, window):
+    """
+    Rolling maximum drawdown (negative fraction) of the equity within each window.
+
+    The window's starting capital counts as a peak, matching
+    ``backtest.max_drawdown`` applied to the window's returns.
+    """
+    returns = check_window(returns, window)
+    return pad_windowed(_window_max_drawdown(returns, window), window)
+
+
+def _window_max_drawdown(returns, window):
+    log_equity = np.zeros(returns.shape[:-1] + (returns.shape[-1] + 1,))
+    np.cumsum(np.log1p(returns), axis=-1, out=log_equity[..., 1:])
+    drop = _sliding_max_drop(log_equity, window + 1)
+    return np.expm1(-drop)
+
+
+def rolling_calmar(returns, window, periods=TRADING_DAYS):
+    """Rolling Calmar ratio: annualized window return over absolute max drawdown."""
+    returns = check_window(returns, window)
+    log_growth = window_sums(np.log1p(returns), window)
+    annual = np.expm1(log_growth * periods / window)
+    mdd = np.abs(_window_max_drawdown(returns, window))
+    safe_mdd = np.where(mdd > 0, mdd, 1.0)
+    # No drawdown: unbounded for a positive return, else 0
+    calmar = np.where(mdd > 0, annual / safe_mdd, np.where(annual > 0, np.inf, 0.0))
+    return pad_windowed(calmar, window)
@@ -0,0 +1,322 @@
+"""
+Micro-Batching Inference Server
+
+Serves a trained direction MLP over local HTTP or a Unix socket using only
+``asyncio``. Concurrent requests are coalesced into micro-batches: the first
+queued request opens a window of ``max_latency_ms``, everything that arrives
+within it (up to ``max_batch_size`` rows) is stacked and scored with one
+forward pass of a frozen ``inference`` plan, and each request gets its own
+slice of the probabilities.
+
+Endpoints:
+- ``POST /predict`` with ``{"features": [[...], ...]}`` (or one flat row)
+  returns ``{"probabilities": [...]}``
+- ``GET /metrics`` returns request / batch counts and p50 / p99 latency
+- ``GET /health`` returns ``{"status": "ok"}``
+
+Connections are kept alive, so a client can stream many requests over one
+socket.
+
+Usage:
+    from nn_finance.serving import run_server
+
+    run_server('models/direction.nnw', port=8100, max_latency_ms=2.0)
+
+    # or from a shell
+    python -m nn_finance.serving models/direction.nnw --unix /tmp/nn.sock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from .inference import freeze
+from .mlp import load_params
+from .weights import load_weights
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            500: 'Internal Server Error'}
+
+
+class LatencyTracker:
+    """
+    Ring buffer of the most recent request latencies.
+
+    Parameters
+    ----------
+    size : int, optional
+        Latencies kept for percentile estimates
+    """
+
+    def __init__(self, size=100_000):
+        self.values = np.zeros(size)
+        self.count = 0
+
+    def record(self, seconds):
+        self.values[self.count % len(self.values)] = seconds
+        self.count += 1
+
+    def percentiles(self, q=(50, 99)):
+        """Latency percentiles in milliseconds (None before the first request)."""
+        window = self.values[:min(self.count, len(self.values))]
+        if not len(window):
+            return {f'p{p}': None for p in q}
+        return {f'p{p}': float(v) * 1000 for p, v in zip(q, np.percentile(window, q))}
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring requests into batched forward passes.
+
+    Parameters
+    ----------
+    params : list of (W, b)
+        MLP parameters
+    max_batch_size : int, optional
+        Maximum rows per forward pass; larger requests are scored in chunks
+    max_latency_ms : float, optional
+        How long the first request of a batch waits for company
+    """
+
+    def __init__(self, params, max_batch_size=1024, max_latency_ms=2.0):
+        self.model = freeze(params)
+        self.n_features = self.model.layer_sizes[0]
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+        self._carry = None
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, X):
+        """Probabilities for ``X`` of shape (n_rows, n_features)."""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start in range(0, max(len(X), 1), self.max_batch_size):
+            future = loop.create_future()
+            await self.queue.put((X[start:start + self.max_batch_size], future))
+            futures.append(future)
+        if len(futures) == 1:
+            return await futures[0]
+        return np.concatenate(await asyncio.gather(*futures))
+
+    async def _collect(self):
+        if self._carry is not None:
+            pending, self._carry = [self._carry], None
+        else:
+            pending = [await self.queue.get()]
+        rows = len(pending[0][0])
+        deadline = asyncio.get_running_loop().time() + self.max_latency
+        while rows < self.max_batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if rows + len(item[0]) > self.max_batch_size:
+                # Opens the next batch instead of overflowing this one
+                self._carry = item
+                break
+            pending.append(item)
+            rows += len(item[0])
+        return pending
+
+    async def _run(self):
+        while True:
+            pending = await self._collect()
+            X = np.concatenate([x for x, _ in pending]) if len(pending) > 1 else pending[0][0]
+            try:
+                # Copy out of the plan's buffer before other batches reuse it
+                probabilities = self.model.predict(X).copy()
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += len(X)
+            offsets = np.cumsum([len(x) for x, _ in pending])[:-1]
+            for (_, future), part in zip(pending, np.split(probabilities, offsets)):
+                if not future.done():
+                    future.set_result(part)
+
+
+class InferenceServer:
+    """
+    asyncio HTTP server in front of a ``MicroBatcher``.
+
+    Parameters
+    ----------
+    params : list of (W, b)
+        MLP parameters
+    max_batch_size, max_latency_ms
+        Passed to ``MicroBatcher``
+    """
+
+    def __init__(self, params, max_batch_size=1024, max_latency_ms=2.0):
+        self.batcher = MicroBatcher(params, max_batch_size, max_latency_ms)
+        self.latency = LatencyTracker()
+        self.requests = 0
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8100, unix_path=None):
+        """Start listening on TCP ``host:port`` or on the Unix socket ``unix_path``."""
+        self.batcher.start()
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    def metrics(self):
+        batches = self.batcher.batches
+        return {
+            'requests': self.requests,
+            'batches': batches,
+            'rows': self.batcher.rows,
+            'mean_batch_rows': self.batcher.rows / batches if batches else 0.0,
+            'latency_ms': self.latency.percentiles(),
+        }
+
+    def _parse_features(self, body):
+        features = np.asarray(json.loads(body)['features'], dtype=float)
+        if features.ndim == 1:
+            features = features[np.newaxis]
+        if features.ndim != 2 or features.shape[1] != self.batcher.n_features:
+            raise ValueError(f"features must have {self.batcher.n_features} columns")
+        if not np.isfinite(features).all():
+            raise ValueError("features must be finite (no NaN or Infinity)")
+        return features
+
+    async def _respond(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, self.metrics()
+        if path != '/predict':
+            return 404, {'error': f'unknown path {path}'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+        try:
+            features = self._parse_features(body)
+        except (ValueError, KeyError, TypeError) as exc:
+            return 400, {'error': str(exc)}
+        start = time.perf_counter()
+        try:
+            probabilities = await self.batcher.predict(features)
+        except Exception as exc:
+            return 500, {'error': f'{type(exc).__name__}: {exc}'}
+        self.latency.record(time.perf_counter() - start)
+        self.requests += 1
+        return 200, {'probabilities': probabilities.tolist()}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self._respond(method, path, body)
+                try:
+                    data = json.dumps(payload, allow_nan=False).encode()
+                except ValueError as exc:
+                    # Never emit bare NaN / Infinity tokens
+                    status = 500
+                    data = json.dumps({'error': str(exc)}).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f'HTTP/1.1 {status} {_REASONS[status]}\r\n'
+                    f'Content-Type: application/json\r\n'
+                    f'Content-Length: {len(data)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode()
+                    + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(params, host='127.0.0.1', port=8100, unix_path=None, max_batch_size=1024,
+                max_latency_ms=2.0):
+    """Run an ``InferenceServer`` until cancelled."""
+    server = await InferenceServer(params, max_batch_size, max_latency_ms).start(
+        host, port, unix_path)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def run_server(params, host='127.0.0.1', port=8100, unix_path=None, max_batch_size=1024,
+               max_latency_ms=2.0):
+    """
+    Blocking entry point.
+
+    Parameters
+    ----------
+    params : list of (W, b) or path
+        MLP parameters, or a path to a ``weights`` file (``.npz`` files from
+        ``mlp.save_params`` are also accepted)
+    host, port : optional
+        TCP address (ignored when ``unix_path`` is given)
+    unix_path : str, optional
+        Serve on a Unix domain socket instead
+    max_batch_size : int, optional
+        Maximum rows per forward pass; larger requests are scored in chunks
+    max_latency_ms : float, optional
+        Batching window opened by the first queued request
+    """
+    if isinstance(params, (str, os.PathLike)):
+        params = load_params(params) if str(params).endswith('.npz') else load_weights(params)
+    asyncio.run(serve(params, host, port, unix_path, max_batch_size, max_latency_ms))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve a direction MLP')
+    parser.add_argument('params', help='weight file (or .npz from mlp.save_params)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--unix', default=None, help='Unix socket path')
+    parser.add_argument('--max-batch-size', type=int, default=1024)
+    parser.add_argument('--max-latency-ms', type=float, default=2.0)
+    args = parser.parse_args()
+    run_server(args.params, args.host, args.port, args.unix, args.max_batch_size,
+               args.max_latency_ms)
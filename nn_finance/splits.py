@@ -0,0 +1,178 @@
+"""
+Time-Series Splits
+
+Chronological train/validation/test splits, walk-forward splits and
+purged / embargoed k-fold splits. Every split is expressed as ``slice``
+objects, so slicing a feature matrix with them returns views: evaluating K
+folds never copies the feature matrix K times.
+
+Usage:
+    from nn_finance.splits import purged_kfold_splits, run_folds
+
+    def fit_fold(X, y, split):
+        X_test = X[split.test]                  # view
+        ...
+        return score
+
+    splits = list(purged_kfold_splits(len(X), n_splits=5, purge=20, embargo=5))
+    scores = run_folds(fit_fold, X, y, splits, n_jobs=5)
+"""
+
+import mmap
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+Split = namedtuple('Split', ['train', 'test'])
+Split.__doc__ = """Train slices (tuple of 1 or 2 slices) and test slice of one fold."""
+
+
+def chronological_split(n_samples, fractions=(0.7, 0.15, 0.15)):
+    """
+    Consecutive slices covering ``n_samples`` in the given proportions.
+
+    The default reproduces the notebook's 70/15/15 train/validation/test split.
+
+    Returns
+    -------
+    slices : tuple of slice
+    """
+    if not np.isclose(sum(fractions), 1.0):
+        raise ValueError("fractions must sum to 1")
+    bounds = [0] + [int(f * n_samples) for f in np.cumsum(fractions[:-1])] + [n_samples]
+    return tuple(slice(a, b) for a, b in zip(bounds[:-1], bounds[1:]))
+
+
+def walk_forward_splits(n_samples, train_size, test_size, step=None, expanding=False,
+                        gap=0):
+    """
+    Walk-forward splits: train on a window, test on the block that follows.
+
+    Parameters
+    ----------
+    n_samples : int
+        Number of samples (time steps)
+    train_size : int
+        Training window length (initial length if ``expanding``)
+    test_size : int
+        Test block length
+    step : int, optional
+        Roll forward by this many samples (default ``test_size``)
+    expanding : bool, optional
+        Keep the training window anchored at 0 instead of rolling it
+    gap : int, optional
+        Samples dropped between train and test (label horizon)
+
+    Yields
+    ------
+    split : Split
+    """
+    step = test_size if step is None else step
+    start = 0
+    while True:
+        train_end = start + train_size
+        test_start = train_end + gap
+        test_end = min(test_start + test_size, n_samples)
+        if test_start >= n_samples:
+            return
+        train = slice(0, train_end) if expanding else slice(start, train_end)
+        yield Split((train,), slice(test_start, test_end))
+        start += step
+
+
+def purged_kfold_splits(n_samples, n_splits=5, purge=0, embargo=0):
+    """
+    Purged and embargoed k-fold splits for time series.
+
+    The data are cut into ``n_splits`` contiguous test blocks. For each block
+    the training set is everything else, minus ``purge`` samples before the
+    block (whose labels overlap the test period) and ``embargo`` samples after
+    it (serially correlated with the test period).
+
+    Yields
+    ------
+    split : Split
+        ``train`` holds up to two slices: before and after the test block
+    """
+    if n_splits < 2:
+        raise ValueError("n_splits must be at least 2")
+    bounds = np.linspace(0, n_samples, n_splits + 1).astype(int).tolist()
+    for test_start, test_end in zip(bounds[:-1], bounds[1:]):
+        train = []
+        if test_start - purge > 0:
+            train.append(slice(0, test_start - purge))
+        if test_end + embargo < n_samples:
+            train.append(slice(test_end + embargo, n_samples))
+        yield Split(tuple(train), slice(test_start, test_end))
+
+
+def split_views(array, slices):
+    """Views of ``array`` for each slice (no copies)."""
+    if isinstance(slices, slice):
+        return array[slices]
+    return [array[s] for s in slices]
+
+
+def train_indices(split):
+    """Integer training indices of a split (materialises an index array)."""
+    return np.concatenate([np.arange(s.start, s.stop) for s in split.train])
+
+
+_FOLD_DATA = {}
+
+
+def _array_ref(array):
+    """Picklable reference to a file-backed memmap, or the array itself."""
+    if isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap):
+        return ('memmap', array.filename, array.offset, array.dtype.str, array.shape,
+                'F' if array.flags.f_contiguous and not array.flags.c_contiguous else 'C')
+    return array
+
+
+def _resolve_array(ref):
+    if isinstance(ref, tuple) and ref and ref[0] == 'memmap':
+        _, filename, offset, dtype, shape, order = ref
+        return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape,
+                         order=order)
+    return ref
+
+
+def _init_fold_worker(X, y):
+    _FOLD_DATA['X'] = _resolve_array(X)
+    _FOLD_DATA['y'] = _resolve_array(y)
+
+
+def _run_fold(fold_fn, split):
+    return fold_fn(_FOLD_DATA['X'], _FOLD_DATA['y'], split)
+
+
+def run_folds(fold_fn, X, y, splits, n_jobs=1):
+    """
+    Run ``fold_fn(X, y, split)`` for every split, optionally in parallel.
+
+    Worker processes receive ``X`` and ``y`` once at start-up: memory-mapped
+    arrays are re-opened from their file, in-memory arrays are inherited
+    under ``fork``. Only the small ``Split`` objects travel per fold.
+
+    Parameters
+    ----------
+    fold_fn : callable
+        Module-level function ``fold_fn(X, y, split) -> result``
+    X, y : ndarray
+        Full feature matrix and targets
+    splits : iterable of Split
+    n_jobs : int, optional
+        Worker processes (1 runs in-process)
+
+    Returns
+    -------
+    results : list
+        One result per split, in split order
+    """
+    splits = list(splits)
+    if n_jobs == 1:
+        return [fold_fn(X, y, split) for split in splits]
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_fold_worker,
+                             initargs=(_array_ref(X), _array_ref(y))) as pool:
+        return list(pool.map(_run_fold, [fold_fn] * len(splits), splits))
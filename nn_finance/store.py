@@ -0,0 +1,118 @@
+"""
+Memory-Mapped Data Store
+
+A store is a directory of standard ``.npy`` files plus a ``manifest.json``
+describing each array (shape, dtype and free-form attributes). Arrays are
+opened with ``np.lib.format.open_memmap`` so large datasets are written and
+read chunk by chunk without ever being fully loaded into RAM.
+
+Usage:
+    from nn_finance.store import create_array, open_array
+
+    returns = create_array('data/synthetic', 'returns', (1_000_000, 250))
+    returns[:10_000] = chunk
+    returns.flush()
+
+    returns = open_array('data/synthetic', 'returns')  # read-only memmap
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def read_manifest(store_dir):
+    """Return the manifest of a store (empty dict if the store is new)."""
+    manifest_path = Path(store_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def _write_manifest(store_dir, manifest):
+    manifest_path = Path(store_dir) / MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(manifest_path)
+
+
+def array_path(store_dir, name):
+    """Path of the ``.npy`` file backing array ``name``."""
+    return Path(store_dir) / f'{name}.npy'
+
+
+def create_array(store_dir, name, shape, dtype='float32', attrs=None):
+    """
+    Create a new array in the store and return it as a writable memmap.
+
+    Parameters
+    ----------
+    store_dir : str or Path
+        Store directory (created if missing)
+    name : str
+        Array name, used as the file stem
+    shape : tuple of int
+        Array shape
+    dtype : str or numpy.dtype, optional
+        Element type (default float32)
+    attrs : dict, optional
+        JSON-serialisable attributes recorded in the manifest
+
+    Returns
+    -------
+    array : numpy.memmap
+        Writable memory-mapped array; call ``flush()`` when done
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    shape = tuple(int(s) for s in shape)
+    dtype = np.dtype(dtype)
+
+    array = np.lib.format.open_memmap(array_path(store_dir, name), mode='w+',
+                                      dtype=dtype, shape=shape)
+
+    manifest = read_manifest(store_dir)
+    manifest[name] = {
+        'file': f'{name}.npy',
+        'shape': list(shape),
+        'dtype': dtype.str,
+        'attrs': attrs or {},
+    }
+    _write_manifest(store_dir, manifest)
+    return array
+
+
+def open_array(store_dir, name, mode='r'):
+    """
+    Open an existing array as a memmap.
+
+    Parameters
+    ----------
+    store_dir : str or Path
+        Store directory
+    name : str
+        Array name
+    mode : {'r', 'r+', 'c'}, optional
+        Memmap mode (default read-only)
+
+    Returns
+    -------
+    array : numpy.memmap
+    """
+    path = array_path(store_dir, name)
+    if not path.exists():
+        raise FileNotFoundError(f"Array '{name}' not found in store {store_dir}")
+    return np.lib.format.open_memmap(path, mode=mode)
+
+
+def array_attrs(store_dir, name):
+    """Return the attributes recorded for ``name`` in the manifest."""
+    manifest = read_manifest(store_dir)
+    if name not in manifest:
+        raise KeyError(f"Array '{name}' not in manifest of {store_dir}")
+    return manifest[name].get('attrs', {})
@@ -0,0 +1,192 @@
+"""
+Streaming Backtest
+
+Event-driven counterpart of ``backtest.run_backtest``: consumes one
+``(signal, market_return)`` event at a time and keeps running metrics with
+O(1) work per event (Welford mean/variance, peak equity, drawdown, hit rate,
+exposure), so the same strategy code runs on live or replayed intraday feeds
+without buffering history.
+
+State can be snapshotted and restored, e.g. to persist at the close and
+resume at the open. Signals and returns may be scalars or arrays (one
+element per strategy); all strategies are then updated in one step.
+
+Usage:
+    from nn_finance.streaming import StreamingBacktest
+
+    bt = StreamingBacktest(rule='long_short', fee_bps=1.0)
+    for signal, market_return in feed:
+        bt.update(signal, market_return)
+    bt.metrics()['sharpe']
+
+    state = bt.snapshot()
+    bt = StreamingBacktest.restore(state)
+"""
+
+import numpy as np
+
+from .backtest import RISK_FREE_RATE, TRADING_DAYS, positions_from_signals
+
+_STATE_FIELDS = ('count', 'mean', 'm2', 'equity', 'peak', 'max_drawdown', 'wins',
+                 'exposure', 'turnover', 'position')
+
+
+class StreamingBacktest:
+    """
+    Running backtest with constant-time updates.
+
+    Parameters
+    ----------
+    rule : str, optional
+        Position rule (see ``backtest.POSITION_RULES``)
+    threshold : float, optional
+        Signal level for going long
+    fee_bps : float, optional
+        Cost per unit of position change, in basis points
+    rf : float, optional
+        Annual risk-free rate for the Sharpe ratio
+    periods : int, optional
+        Events per year used for annualization
+    """
+
+    def __init__(self, rule='long_short', threshold=0.5, fee_bps=0.0, rf=RISK_FREE_RATE,
+                 periods=TRADING_DAYS):
+        self.rule = rule
+        self.threshold = threshold
+        self.fee_bps = fee_bps
+        self.rf = rf
+        self.periods = periods
+        self._state = None
+
+    def _init_state(self, shape):
+        zeros = np.zeros(shape)
+        self._state = {
+            'count': 0,
+            'mean': zeros.copy(),
+            'm2': zeros.copy(),
+            'equity': np.ones(shape),
+            'peak': np.ones(shape),
+            'max_drawdown': zeros.copy(),
+            'wins': zeros.copy(),
+            'exposure': zeros.copy(),
+            'turnover': zeros.copy(),
+            'position': zeros.copy(),
+        }
+
+    def update(self, signal, market_return):
+        """
+        Process one event.
+
+        Parameters
+        ----------
+        signal : float or ndarray
+            Signal(s) for this period
+        market_return : float or ndarray
+            Return of the traded asset over this period (broadcast against
+            ``signal``)
+
+        Returns
+        -------
+        strategy_return : float or ndarray
+            Net return of each strategy for this event
+        """
+        position = positions_from_signals(signal, self.rule, self.threshold)
+        gross = position * np.asarray(market_return, dtype=float)
+        if self._state is None:
+            self._init_state(gross.shape)
+        st = self._state
+
+        traded = np.abs(position - st['position'])
+        r = gross - traded * (self.fee_bps / 1e4)
+
+        # Welford running mean / variance
+        st['count'] += 1
+        delta = r - st['mean']
+        st['mean'] += delta / st['count']
+        st['m2'] += delta * (r - st['mean'])
+
+        st['equity'] *= 1 + r
+        np.maximum(st['peak'], st['equity'], out=st['peak'])
+        np.minimum(st['max_drawdown'], st['equity'] / st['peak'] - 1, out=st['max_drawdown'])
+
+        st['wins'] += r > 0
+        st['exposure'] += np.abs(position)
+        st['turnover'] += traded
+        st['position'] = position
+        return r
+
+    def metrics(self):
+        """
+        Current metrics, matching ``backtest.performance_metrics`` definitions.
+
+        Returns
+        -------
+        metrics : dict
+            'n_events', 'total_return', 'annual_volatility', 'sharpe',
+            'drawdown' (current), 'max_drawdown', 'win_rate', 'exposure'
+            (average absolute position) and 'turnover' (cumulative)
+        """
+        if self._state is None:
+            raise RuntimeError("No events processed yet")
+        st = self._state
+        n = st['count']
+        std = np.sqrt(st['m2'] / n)
+        safe_std = np.where(std > 0, std, 1.0)
+        sharpe = np.where(std > 0,
+                          np.sqrt(self.periods) * (st['mean'] - self.rf / self.periods) / safe_std,
+                          0.0)
+        return {
+            'n_events': n,
+            'total_return': st['equity'] - 1,
+            'annual_volatility': std * np.sqrt(self.periods),
+            'sharpe': sharpe,
+            'drawdown': st['equity'] / st['peak'] - 1,
+            'max_drawdown': st['max_drawdown'].copy(),
+            'win_rate': st['wins'] / n,
+            'exposure': st['exposure'] / n,
+            'turnover': st['turnover'].copy(),
+        }
+
+    def snapshot(self):
+        """Serializable copy of configuration and running state."""
+        state = None
+        if self._state is not None:
+            state = {k: (np.array(v).tolist() if k != 'count' else v)
+                     for k, v in self._state.items()}
+        return {
+            'config': {
+                'rule': self.rule,
+                'threshold': self.threshold,
+                'fee_bps': self.fee_bps,
+                'rf': self.rf,
+                'periods': self.periods,
+            },
+            'state': state,
+        }
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Rebuild a backtester from ``snapshot()`` output."""
+        bt = cls(**snapshot['config'])
+        state = snapshot['state']
+        if state is not None:
+            missing = set(_STATE_FIELDS) - set(state)
+            if missing:
+                raise ValueError(f"Snapshot is missing state fields: {sorted(missing)}")
+            bt._state = {k: (np.array(state[k], dtype=float) if k != 'count' else int(state[k]))
+                         for k in _STATE_FIELDS}
+        return bt
+
+
+def run_stream(events, **kwargs):
+    """
+    Feed an iterable of ``(signal, market_return)`` events to a new backtester.
+
+    Returns
+    -------
+    backtester : StreamingBacktest
+    """
+    bt = StreamingBacktest(**kwargs)
+    for signal, market_return in events:
+        bt.update(signal, market_return)
+    return bt
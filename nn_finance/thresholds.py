@@ -0,0 +1,169 @@
+"""
+P&L-Weighted Threshold Optimization
+
+Links the precision / recall trade-off of ``19_confusion_matrix`` to trading
+results: for every candidate probability threshold, the confusion counts and
+the P&L, Sharpe ratio and turnover of trading ``score >= threshold`` as the
+long signal, and the threshold that maximizes the chosen objective.
+
+All thresholds are evaluated in one pass. Scores are sorted once; cumulative
+sums of returns, squared returns, log growth and up-days in score order give
+every threshold's totals by indexing. A position changes between two days
+exactly when the threshold lies between their scores, so turnover is two
+``searchsorted`` calls over the sorted interval bounds.
+
+Usage:
+    from nn_finance.thresholds import optimize_threshold
+
+    sweep = optimize_threshold(probabilities, forward_returns, rule='long_short',
+                               objective='sharpe', fee_bps=1.0)
+    sweep['best']['threshold'], sweep['best']['sharpe']
+    sweep['sharpe']       # one value per candidate threshold
+"""
+
+import numpy as np
+
+from .backtest import RISK_FREE_RATE, TRADING_DAYS
+from .confusion import curves_from_counts
+
+RULES = ('long_short', 'long_only')
+OBJECTIVES = ('sharpe', 'total_return', 'pnl', 'net_pnl', 'f1', 'accuracy')
+
+
+def _changes(scores, thresholds):
+    """Days on which ``scores >= threshold`` flips, for every threshold."""
+    lo = np.sort(np.minimum(scores[1:], scores[:-1]))
+    hi = np.sort(np.maximum(scores[1:], scores[:-1]))
+    # Flip when lo < threshold <= hi
+    return (np.searchsorted(lo, thresholds, side='left')
+            - np.searchsorted(hi, thresholds, side='left'))
+
+
+def threshold_sweep(scores, returns, thresholds=None, rule='long_short', fee_bps=0.0,
+                    rf=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """
+    Confusion counts and trading results at every threshold.
+
+    Parameters
+    ----------
+    scores : ndarray, shape (n_days,)
+        Predicted probability of an up move, in time order
+    returns : ndarray, shape (n_days,)
+        Return traded on each day's signal; ``returns > 0`` is the true class
+    thresholds : ndarray, optional
+        Candidate thresholds (default: every distinct score, decreasing)
+    rule : str, optional
+        One of ``RULES``: short or flat below the threshold
+    fee_bps : float, optional
+        Cost per unit of turnover in basis points (lowers net P&L and the
+        Sharpe ratio's mean; volatility is that of gross returns)
+    rf : float, optional
+        Annual risk-free rate for the Sharpe ratio
+    periods : int, optional
+        Periods per year
+
+    Returns
+    -------
+    sweep : dict
+        Arrays over thresholds: the ``confusion.threshold_curves`` keys plus
+        'pnl' (sum of daily returns), 'net_pnl', 'total_return'
+        (compounded, net of fees), 'gross_total_return', 'sharpe',
+        'turnover' (units traded) and 'annual_turnover'. NaN days are
+        dropped. The net total return charges each unit traded as a
+        ``fee_bps`` haircut on equity, ``log1p(-fee) * turnover`` in log
+        space; per-day fees taken from that day's return differ only at
+        second order.
+    """
+    if rule not in RULES:
+        raise ValueError(f"Unknown rule '{rule}', expected one of {RULES}")
+    scores = np.asarray(scores, dtype=float).ravel()
+    returns = np.asarray(returns, dtype=float).ravel()
+    keep = ~(np.isnan(scores) | np.isnan(returns))
+    scores, returns = scores[keep], returns[keep]
+    n = len(scores)
+    if not n:
+        raise ValueError("No days with both a score and a return")
+
+    order = np.argsort(-scores, kind='stable')
+    if thresholds is None:
+        thresholds = np.unique(scores)[::-1]
+    thresholds = np.asarray(thresholds, dtype=float)
+    # Number of days at or above each threshold = prefix length in score order
+    k = n - np.searchsorted(scores[order[::-1]], thresholds, side='left')
+
+    def above(values):
+        c = np.zeros(n + 1)
+        np.cumsum(values[order], out=c[1:])
+        return c[k], c[-1]
+
+    up = returns > 0
+    tp, n_pos = above(up)
+    curves = curves_from_counts(thresholds, tp, k - tp, int(n_pos), n - int(n_pos))
+
+    r_above, r_total = above(returns)
+    sq_above, sq_total = above(returns * returns)
+    g_above, _ = above(np.log1p(returns))
+    flips = _changes(scores, thresholds)
+    if rule == 'long_short':
+        pnl = 2 * r_above - r_total
+        sum_sq = np.full(len(thresholds), sq_total)
+        short_above, short_total = above(np.log1p(-returns))
+        growth = g_above + short_total - short_above
+        turnover = 1.0 + 2.0 * flips
+    else:
+        pnl = r_above
+        sum_sq = sq_above
+        growth = g_above
+        turnover = (scores[0] >= thresholds) + flips.astype(float)
+
+    net_pnl = pnl - fee_bps * 1e-4 * turnover
+    mean = net_pnl / n
+    std = np.sqrt(np.maximum(sum_sq / n - (pnl / n) ** 2, 0.0))
+    safe_std = np.where(std > 0, std, 1.0)
+    curves.update({
+        'pnl': pnl,
+        'net_pnl': net_pnl,
+        'total_return': np.expm1(growth + np.log1p(-fee_bps * 1e-4) * turnover),
+        'gross_total_return': np.expm1(growth),
+        'sharpe': np.where(std > 0, np.sqrt(periods) * (mean - rf / periods) / safe_std, 0.0),
+        'turnover': turnover,
+        'annual_turnover': turnover * periods / n,
+    })
+    return curves
+
+
+def optimize_threshold(scores, returns, objective='sharpe', thresholds=None,
+                       rule='long_short', fee_bps=0.0, min_coverage=0.0,
+                       rf=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """
+    Threshold sweep plus the operating point maximizing ``objective``.
+
+    Parameters
+    ----------
+    scores, returns, thresholds, rule, fee_bps, rf, periods
+        See ``threshold_sweep``
+    objective : str, optional
+        One of ``OBJECTIVES``
+    min_coverage : float, optional
+        Minimum share of days predicted up; excludes cuts that trade only a
+        handful of extreme scores
+
+    Returns
+    -------
+    sweep : dict
+        ``threshold_sweep`` output plus 'best': the threshold and every
+        metric at the optimum (scalars)
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {OBJECTIVES}")
+    sweep = threshold_sweep(scores, returns, thresholds, rule, fee_bps, rf, periods)
+    n = sweep['tp'][0] + sweep['fp'][0] + sweep['fn'][0] + sweep['tn'][0]
+    coverage = (sweep['tp'] + sweep['fp']) / n
+    value = np.where(coverage >= min_coverage, sweep[objective], -np.inf)
+    i = int(np.argmax(value))
+    best = {'threshold': float(sweep['thresholds'][i]), 'coverage': float(coverage[i])}
+    for key, v in sweep.items():
+        if key != 'thresholds':
+            best[key] = v[i].item() if isinstance(v, np.ndarray) else v
+    sweep['best'] = best
+    return sweep
@@ -0,0 +1,153 @@
+"""
+Walk-Forward Retrain-and-Trade Backtest
+
+Replaces the chart's simulated 70% signal with an actual trained model:
+train the MLP on a rolling window, predict the next block, roll forward,
+then stitch the out-of-sample probabilities into the backtest engine.
+
+Fold models train in parallel and are cached on disk under a key built from
+the data fingerprint, the fold window and the hyperparameters. Re-running
+with different cost assumptions, thresholds or position rules reuses every
+cached model instead of retraining. Cached models are ``weights`` files,
+memory-mapped on load.
+
+Row ``t`` of ``X`` / ``y`` must describe the trade whose return is
+``returns[t]`` (``y[t] = returns[t] > 0``); use ``gap`` to drop the label
+horizon between training and test windows.
+
+Usage:
+    from nn_finance.walkforward import walk_forward_backtest
+
+    result = walk_forward_backtest(X, y, fwd_returns, train_size=500, test_size=60,
+                                   hyperparams={'hidden_sizes': (8,), 'epochs': 300},
+                                   cache_dir='cache/wf', n_jobs=4,
+                                   costs={'fee_bps': 1, 'slippage_bps': 2})
+    result['backtest']['metrics']['sharpe']
+"""
+
+import hashlib
+import json
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from .backtest import run_backtest
+from .mlp import predict_proba, train_mlp
+from .splits import run_folds, walk_forward_splits
+from .weights import load_weights, save_weights
+
+DEFAULT_HYPERPARAMS = {
+    'hidden_sizes': (8,),
+    'learning_rate': 0.5,
+    'epochs': 200,
+    'batch_size': None,
+    'l2': 0.0,
+    'seed': 42,
+}
+
+
+def data_fingerprint(*arrays, chunk_rows=65536):
+    """SHA-256 of the shapes, dtypes and contents of ``arrays`` (read in chunks)."""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.asarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        for s in range(0, max(len(array), 1), chunk_rows):
+            digest.update(np.ascontiguousarray(array[s:s + chunk_rows]).tobytes())
+    return digest.hexdigest()
+
+
+def fold_cache_key(data_hash, split, hyperparams):
+    """Cache key for one fold model: data fingerprint, window and hyperparameters."""
+    window = [[s.start, s.stop] for s in split.train]
+    payload = json.dumps({'data': data_hash, 'train': window, 'hyperparams': hyperparams},
+                         sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _train_fold(X, y, split, hyperparams):
+    if len(split.train) == 1:
+        X_train, y_train = X[split.train[0]], y[split.train[0]]
+    else:
+        X_train = np.concatenate([X[s] for s in split.train])
+        y_train = np.concatenate([y[s] for s in split.train])
+    params, _ = train_mlp(X_train, y_train, **hyperparams)
+    return params
+
+
+def walk_forward_backtest(X, y, returns, train_size, test_size, step=None, expanding=False,
+                          gap=0, hyperparams=None, cache_dir=None, n_jobs=1,
+                          rule='long_short', threshold=0.5, costs=None):
+    """
+    Walk-forward train / predict / backtest.
+
+    Parameters
+    ----------
+    X : ndarray, shape (n_samples, n_features)
+        Features (already scaled)
+    y : ndarray, shape (n_samples,)
+        Direction targets in {0, 1}
+    returns : ndarray, shape (n_samples,)
+        Return traded on the signal of each row
+    train_size, test_size, step, expanding, gap
+        Window layout, see ``splits.walk_forward_splits``
+    hyperparams : dict, optional
+        Overrides of ``DEFAULT_HYPERPARAMS`` passed to ``mlp.train_mlp``
+    cache_dir : str or Path, optional
+        Directory for cached fold models (no caching if None)
+    n_jobs : int, optional
+        Worker processes for training uncached folds
+    rule, threshold, costs
+        Passed to ``backtest.run_backtest``
+
+    Returns
+    -------
+    result : dict
+        'probabilities' (NaN outside test blocks), 'oos' (slice covering the
+        stitched out-of-sample period), 'folds' (list of dicts with 'split',
+        'key' and 'cached'), 'params' (one parameter list per fold) and
+        'backtest' (``run_backtest`` result over the out-of-sample period)
+    """
+    hyperparams = {**DEFAULT_HYPERPARAMS, **(hyperparams or {})}
+    splits = list(walk_forward_splits(len(X), train_size, test_size, step, expanding, gap))
+    if not splits:
+        raise ValueError("Not enough samples for a single walk-forward fold")
+
+    data_hash = data_fingerprint(X, y)
+    keys = [fold_cache_key(data_hash, split, hyperparams) for split in splits]
+    cache_dir = Path(cache_dir) if cache_dir is not None else None
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    fold_params = [None] * len(splits)
+    cached = [False] * len(splits)
+    if cache_dir is not None:
+        for i, key in enumerate(keys):
+            path = cache_dir / f'{key}.nnw'
+            if path.exists():
+                fold_params[i] = load_weights(path)
+                cached[i] = True
+
+    todo = [i for i in range(len(splits)) if fold_params[i] is None]
+    trained = run_folds(partial(_train_fold, hyperparams=hyperparams), X, y,
+                        [splits[i] for i in todo], n_jobs=n_jobs)
+    for i, params in zip(todo, trained):
+        fold_params[i] = params
+        if cache_dir is not None:
+            save_weights(cache_dir / f'{keys[i]}.nnw', params, metadata={'key': keys[i]})
+
+    probabilities = np.full(len(X), np.nan)
+    for split, params in zip(splits, fold_params):
+        probabilities[split.test] = predict_proba(params, X[split.test])
+
+    oos = slice(splits[0].test.start, splits[-1].test.stop)
+    backtest = run_backtest(probabilities[oos], np.asarray(returns)[oos], rule=rule,
+                            threshold=threshold, costs=costs)
+    return {
+        'probabilities': probabilities,
+        'oos': oos,
+        'folds': [{'split': s, 'key': k, 'cached': c} for s, k, c in zip(splits, keys, cached)],
+        'params': fold_params,
+        'backtest': backtest,
+    }
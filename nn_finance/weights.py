@@ -0,0 +1,166 @@
+"""
+Memory-Mappable Weight Files
+
+A compact file format for MLP parameters that loads without unpickling or
+copying. Layout:
+
+- 16-byte prefix: magic ``b'NNFWGT\\0\\0'``, format version (uint32) and
+  header length (uint32), little-endian
+- JSON header: format version, one entry per array (name, shape, dtype,
+  offset, nbytes), a CRC-32 of the blob region and free-form metadata
+- contiguous weight blobs, each starting on a 64-byte boundary
+
+Loading maps the file once with ``mmap`` and returns read-only array views,
+so many worker processes share one page-cached copy and a cold load only
+parses the small header. The checksum is checked on request
+(``verify=True`` or ``verify_weights``) because it has to read every byte.
+
+Usage:
+    from nn_finance.weights import save_weights, load_weights
+
+    save_weights('models/direction.nnw', params, metadata={'trained': '2024-06-28'})
+    params = load_weights('models/direction.nnw')          # read-only memmap views
+"""
+
+import json
+import mmap as mmap_module
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'NNFWGT\0\0'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct('<8sII')
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _layout(arrays, start):
+    entries = []
+    offset = start
+    for name, array in arrays:
+        offset = _aligned(offset)
+        entries.append({'name': name, 'shape': list(array.shape),
+                        'dtype': array.dtype.str, 'offset': offset,
+                        'nbytes': array.nbytes})
+        offset += array.nbytes
+    return entries, offset
+
+
+def save_weights(path, params, dtype=None, metadata=None):
+    """
+    Write parameters to a weight file (atomically, via a temporary file).
+
+    Parameters
+    ----------
+    path : str or Path
+        Output file
+    params : list of (W, b)
+        MLP parameters
+    dtype : str or numpy.dtype, optional
+        Store every array in this dtype (default: keep each array's dtype)
+    metadata : dict, optional
+        JSON-serialisable information recorded in the header
+    """
+    path = Path(path)
+    arrays = []
+    for i, (W, b) in enumerate(params):
+        for name, array in ((f'W{i}', W), (f'b{i}', b)):
+            array = np.ascontiguousarray(array, dtype=dtype)
+            arrays.append((name, array.astype(array.dtype.newbyteorder('<'), copy=False)))
+
+    # The header size depends on the offsets, which depend on the header size:
+    # lay out against an estimate and grow it until the final header fits
+    header = {'version': FORMAT_VERSION, 'metadata': metadata or {}, 'crc32': 0}
+    estimate = len(json.dumps({**header, 'arrays': _layout(arrays, 0)[0]}).encode()) + 256
+    while True:
+        data_start = _aligned(_PREFIX.size + estimate)
+        entries, end = _layout(arrays, data_start)
+        blob = bytearray(end - data_start)
+        for (_, array), entry in zip(arrays, entries):
+            start = entry['offset'] - data_start
+            blob[start:start + entry['nbytes']] = array.tobytes()
+        header.update({'arrays': entries, 'crc32': zlib.crc32(blob)})
+        encoded = json.dumps(header).encode()
+        if len(encoded) <= data_start - _PREFIX.size:
+            break
+        estimate = len(encoded) + 256
+    encoded += b' ' * (data_start - _PREFIX.size - len(encoded))
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        f.write(blob)
+    tmp_path.replace(path)
+
+
+def _read_header(f, path):
+    magic, version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a weight file")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {version}, "
+                         f"this reader supports up to {FORMAT_VERSION}")
+    return json.loads(f.read(length))
+
+
+def read_header(path):
+    """Parse and return the JSON header of a weight file."""
+    with open(path, 'rb') as f:
+        return _read_header(f, path)
+
+
+def _blob_start(header):
+    return min((entry['offset'] for entry in header['arrays']), default=0)
+
+
+def verify_weights(path):
+    """True if the blob region matches the header checksum."""
+    header = read_header(path)
+    with open(path, 'rb') as f:
+        f.seek(_blob_start(header))
+        return zlib.crc32(f.read()) == header['crc32']
+
+
+def load_weights(path, mmap=True, verify=False):
+    """
+    Load parameters saved by ``save_weights``.
+
+    Parameters
+    ----------
+    path : str or Path
+        Weight file
+    mmap : bool, optional
+        Return read-only views of one shared memory map (default) instead of
+        arrays backed by an in-memory copy of the file
+    verify : bool, optional
+        Check the CRC-32 first (reads the whole file)
+
+    Returns
+    -------
+    params : list of (W, b)
+    """
+    if verify and not verify_weights(path):
+        raise ValueError(f"Checksum mismatch in {path}")
+    with open(path, 'rb') as f:
+        header = _read_header(f, path)
+        if mmap:
+            # The mapping stays valid after the file is closed
+            data = np.frombuffer(mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ),
+                                 dtype=np.uint8)
+        else:
+            f.seek(0)
+            data = np.frombuffer(f.read(), dtype=np.uint8)
+
+    arrays = {}
+    for entry in header['arrays']:
+        raw = data[entry['offset']:entry['offset'] + entry['nbytes']]
+        arrays[entry['name']] = raw.view(np.dtype(entry['dtype'])).reshape(entry['shape'])
+    n_layers = len(arrays) // 2
+    return [(arrays[f'W{i}'], arrays[f'b{i}']) for i in range(n_layers)]